@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Query
+import asyncio
 from typing import List, Optional
 from ..schemas.workflow import (
     GenerateWorkflowRequest,
@@ -38,14 +39,18 @@ async def generate_workflow(request: GenerateWorkflowRequest):
     try:
         # Validate that files exist if file_ids provided
         if request.file_ids:
-            for file_id in request.file_ids:
-                try:
-                    await file_service.get_file(file_id)
-                except ValueError:
+            lookups = await asyncio.gather(
+                *[file_service.get_file(file_id) for file_id in request.file_ids],
+                return_exceptions=True
+            )
+            for file_id, lookup in zip(request.file_ids, lookups):
+                if isinstance(lookup, ValueError):
                     raise HTTPException(
                         status_code=404,
                         detail=f"File {file_id} not found"
                     )
+                if isinstance(lookup, Exception):
+                    raise lookup
         
         # Generate workflow with full context
         workflow = await workflow_service.generate_workflow(
@@ -1,20 +1,25 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ...domain.models import WorkflowGraph, ExecutionContext
 from ...domain.services.dependency_resolver import DependencyResolver
-from ...infrastructure.agents.agent_executor import DynamicAgentExecutor
-from ...infrastructure.database.mongodb import get_mongodb
+from ...infrastructure.agents.agent_executor import DynamicAgentExecutor, render_files_block
+from ...infrastructure.database.mongodb import MongoDBClientMixin
 from datetime import datetime
 import uuid
-import asyncio
-import json
+import logging
 
-class ExecutionService:
+logger = logging.getLogger(__name__)
+
+class ExecutionService(MongoDBClientMixin):
     """Service for executing workflows with full file context"""
     
     def __init__(self):
         self.agent_executor = DynamicAgentExecutor()
         self.dependency_resolver = DependencyResolver()
     
+    async def aclose(self) -> None:
+        """Wait for background work started by agent executions"""
+        await self.agent_executor.aclose()
+    
     async def execute_workflow(
         self,
         workflow: WorkflowGraph,
@@ -22,14 +27,17 @@ class ExecutionService:
     ) -> Dict[str, Any]:
         """Execute workflow with complete file context"""
         
-        print(f"\n{'='*80}")
-        print(f"🚀 EXECUTING WORKFLOW: {workflow.name}")
-        print(f"{'='*80}\n")
+        logger.info("🚀 EXECUTING WORKFLOW: %s", workflow.name)
+        
+        # Dump agents/edges once; validation, ordering and execution share them
+        agents = [agent.model_dump() for agent in workflow.agents]
+        agent_configs = {agent["id"]: agent for agent in agents}
+        edges = [edge.model_dump() for edge in workflow.edges]
         
         # Validate workflow
         validation = self.dependency_resolver.validate_workflow(
-            agents=[agent.model_dump() for agent in workflow.agents],
-            edges=[edge.model_dump() for edge in workflow.edges]
+            agents=agents,
+            edges=edges
         )
         
         if not validation["valid"]:
@@ -38,6 +46,9 @@ class ExecutionService:
         # Gather file context
         files_context = await self._gather_files_context(workflow.user_id, file_ids)
         
+        # Same for every agent, so render the files section of the prompt once
+        files_block = render_files_block(files_context["files"])
+        
         # Create execution context
         execution_id = f"exec_{uuid.uuid4().hex[:12]}"
         context = ExecutionContext(
@@ -52,7 +63,7 @@ class ExecutionService:
         context.agent_outputs["user_files"] = files_context["files"]
         
         # Save initial execution state
-        db = await get_mongodb()
+        db = await self._get_db()
         await db.get_collection("executions").insert_one({
             "id": execution_id,
             **context.model_dump()
@@ -60,42 +71,39 @@ class ExecutionService:
         
         # Get execution order
         execution_levels = self.dependency_resolver.topological_sort(
-            agents=[agent.model_dump() for agent in workflow.agents],
-            edges=[edge.model_dump() for edge in workflow.edges]
+            agents=agents,
+            edges=edges
         )
         
-        print(f"📊 Execution Plan:")
-        for i, level in enumerate(execution_levels):
-            agents_in_level = [a.name for a in workflow.agents if a.id in level]
-            print(f"  Level {i+1}: {', '.join(agents_in_level)}")
-        print()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 Execution Plan:")
+            for i, level in enumerate(execution_levels):
+                agents_in_level = [a.name for a in workflow.agents if a.id in level]
+                logger.debug("  Level %d: %s", i + 1, ", ".join(agents_in_level))
         
         # Execute level by level
         for level_num, agent_ids in enumerate(execution_levels, 1):
-            print(f"\n{'='*60}")
-            print(f"📍 Executing Level {level_num}")
-            print(f"{'='*60}\n")
+            logger.info("📍 Executing Level %d", level_num)
             
             agents_in_level = [a for a in workflow.agents if a.id in agent_ids]
             
-            # Execute agents in parallel
-            tasks = []
-            for agent in agents_in_level:
-                # Build complete input with file context
-                input_data = self._build_agent_input(
-                    agent,
-                    context.agent_outputs,
-                    files_context
+            # Execute agents in parallel (bounded by the executor)
+            batch = [
+                (
+                    agent_configs[agent.id],
+                    # Build complete input with file context
+                    self._build_agent_input(
+                        agent,
+                        context.agent_outputs,
+                        files_context,
+                        files_block
+                    )
                 )
-                
-                task = self.agent_executor.execute_agent(
-                    agent_config=agent.model_dump(),
-                    input_data=input_data
-                )
-                tasks.append(task)
+                for agent in agents_in_level
+            ]
             
             # Wait for all agents
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = await self.agent_executor.execute_agents_batch(batch)
             
             # Store outputs
             for agent, result in zip(agents_in_level, results):
@@ -106,22 +114,17 @@ class ExecutionService:
                     }
                     context.status = "failed"
                 else:
-                    # Try to parse as JSON if possible
-                    output = result["output"]
-                    try:
-                        parsed_output = json.loads(output) if isinstance(output, str) and output.startswith('{') else output
-                        context.agent_outputs[agent.id] = parsed_output
-                    except:
-                        context.agent_outputs[agent.id] = output
-                
-                # Update execution in DB
-                await db.get_collection("executions").update_one(
-                    {"id": execution_id},
-                    {"$set": {
-                        "agent_outputs": context.agent_outputs,
-                        "status": context.status
-                    }}
-                )
+                    # Already parsed by the executor - a string here is not JSON
+                    context.agent_outputs[agent.id] = result["output"]
+            
+            # Update execution in DB once per level, not once per agent
+            await db.get_collection("executions").update_one(
+                {"id": execution_id},
+                {"$set": {
+                    "agent_outputs": context.agent_outputs,
+                    "status": context.status
+                }}
+            )
         
         # Mark complete
         if context.status != "failed":
@@ -141,9 +144,7 @@ class ExecutionService:
         final_agent_id = workflow.agents[-1].id
         final_output = context.agent_outputs.get(final_agent_id, "No output")
         
-        print(f"\n{'='*80}")
-        print(f"✅ WORKFLOW {context.status.upper()}")
-        print(f"{'='*80}\n")
+        logger.info("✅ WORKFLOW %s", context.status.upper())
         
         return {
             "execution_id": execution_id,
@@ -159,12 +160,12 @@ class ExecutionService:
     ) -> Dict[str, Any]:
         """Gather complete file context for execution"""
         
-        db = await get_mongodb()
+        db = await self._get_db()
         files_data = []
         
         if file_ids:
-            for file_id in file_ids:
-                file_record = await db.get_collection("files").find_one({"id": file_id})
+            file_records = await db.find_by_ids("files", file_ids)
+            for file_record in file_records:
                 if file_record:
                     files_data.append(self._format_file_context(file_record))
         else:
@@ -204,7 +205,8 @@ class ExecutionService:
         self,
         agent: Any,
         outputs: Dict[str, Any],
-        files_context: Dict[str, Any]
+        files_context: Dict[str, Any],
+        files_block: Optional[str] = None
     ) -> Dict[str, Any]:
         """Build complete input for agent including files and previous outputs"""
         
@@ -212,6 +214,8 @@ class ExecutionService:
             "files": files_context["files"],
             "task": agent.task
         }
+        if files_block is not None:
+            agent_input["files_block"] = files_block
         
         # Add outputs from dependent agents
         for input_ref in agent.inputs:
@@ -222,7 +226,7 @@ class ExecutionService:
     
     async def get_execution(self, execution_id: str) -> Dict[str, Any]:
         """Get execution details"""
-        db = await get_mongodb()
+        db = await self._get_db()
         execution = await db.get_collection("executions").find_one({"id": execution_id})
         
         if not execution:
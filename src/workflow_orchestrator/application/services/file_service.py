@@ -1,27 +1,36 @@
-from typing import Dict, Any, BinaryIO
+from typing import Dict, Any, BinaryIO, Optional
+import asyncio
 import uuid
 import os
 from datetime import datetime
-import json
-import shutil
+import hashlib
+import logging
+import orjson
 
-from ...infrastructure.database.mongodb import get_mongodb
-from ...infrastructure.file_processors.excel_processor import ExcelProcessor
-from ...infrastructure.file_processors.csv_processor import CSVProcessor
-from ...infrastructure.file_processors.pdf_processor import PDFProcessor
+from ...infrastructure.database.mongodb import MongoDBClientMixin
+from ...infrastructure.file_processors import FileProcessorFactory
 from ...config import settings
 
+logger = logging.getLogger(__name__)
 
-class FileService:
+# Stored with each file record; bump when processor output changes so
+# results of older processors are not reused for identical uploads
+PROCESSING_VERSION = 1
+
+# Upload copy/hash block size
+_COPY_CHUNK_BYTES = 1024 * 1024
+
+
+def _dump_row(row: Dict[str, Any]) -> str:
+    """Compact JSON for a sample row (cell values may be dates etc.)"""
+    return orjson.dumps(row, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class FileService(MongoDBClientMixin):
     """Application service for file operations"""
     
     def __init__(self):
-        self.processors = {
-            '.xlsx': ExcelProcessor(),
-            '.xls': ExcelProcessor(),
-            '.csv': CSVProcessor(),
-            '.pdf': PDFProcessor()
-        }
+        self._hash_index_ready = False
     
     async def upload_file(
         self,
@@ -41,21 +50,27 @@ class FileService:
         # Save file
         file_path = os.path.join(settings.UPLOAD_DIR, f"{file_id}{file_ext}")
         
-        # Use shutil.copyfileobj for sync file objects
-        with open(file_path, 'wb') as f:
-            shutil.copyfileobj(file, f)
-        
-        print(f"✅ File saved: {file_path}")
+        # Copy the sync file object on a worker thread so large uploads
+        # don't block the event loop for other requests
+        content_hash = await asyncio.to_thread(self._save_upload, file, file_path)
         
-        # Process file
-        processor = self.processors.get(file_ext)
-        if not processor:
-            raise ValueError(f"Unsupported file type: {file_ext}")
+        logger.info("✅ File saved: %s", file_path)
         
-        processed_data = await processor.process(file_path)
-        text_content = await processor.extract_text(file_path)
+        # Process file with the shared processor instances
+        processor = FileProcessorFactory.get_processor(file_ext)
         
-        print(f"✅ File processed: {len(text_content)} characters extracted")
+        db = await self._get_db()
+        cached = await self._find_processed(db, content_hash, file_ext)
+        if cached is not None:
+            processed_data = cached["processed_data"]
+            # The text names the stored file; point it at the new copy
+            text_content = cached["text_content"].replace(
+                os.path.basename(cached["file_path"]), os.path.basename(file_path), 1
+            )
+            logger.info("♻️  Reusing processed content of identical upload")
+        else:
+            processed_data, text_content = await processor.process_with_text(file_path)
+            logger.info("✅ File processed: %d characters extracted", len(text_content))
         
         # Create file record with proper datetime handling
         file_record = {
@@ -66,15 +81,16 @@ class FileService:
             "file_path": file_path,
             "processed_data": processed_data,
             "text_content": text_content,
+            "content_hash": content_hash,
+            "processing_version": PROCESSING_VERSION,
             "created_at": datetime.utcnow(),
             "updated_at": datetime.utcnow()
         }
         
         # Save to database
-        db = await get_mongodb()
         await db.get_collection("files").insert_one(file_record)
         
-        print(f"✅ File record saved to database: {file_id}")
+        logger.info("✅ File record saved to database: %s", file_id)
         
         # Return serializable response
         return {
@@ -91,10 +107,45 @@ class FileService:
             }
         }
     
+    def _save_upload(self, file: BinaryIO, file_path: str) -> str:
+        """Write uploaded file object to disk (blocking), returns content hash
+        
+        The hash is computed on the same pass as the copy, so the file is
+        never read back.
+        """
+        digest = hashlib.blake2b()
+        with open(file_path, 'wb') as f:
+            while chunk := file.read(_COPY_CHUNK_BYTES):
+                digest.update(chunk)
+                f.write(chunk)
+        return digest.hexdigest()
+    
+    async def _find_processed(
+        self,
+        db: Any,
+        content_hash: str,
+        file_ext: str
+    ) -> Optional[Dict[str, Any]]:
+        """Find processed content of an earlier upload with identical bytes"""
+        files = db.get_collection("files")
+        if not self._hash_index_ready:
+            await files.create_index("content_hash")
+            self._hash_index_ready = True
+        
+        return await files.find_one(
+            {
+                "content_hash": content_hash,
+                "file_type": file_ext,
+                "processing_version": PROCESSING_VERSION
+            },
+            {"processed_data": 1, "text_content": 1, "file_path": 1}
+        )
+    
     async def get_file(self, file_id: str) -> Dict[str, Any]:
         """Get file details"""
-        db = await get_mongodb()
-        file_record = await db.get_collection("files").find_one({"id": file_id})
+        db = await self._get_db()
+        async with db.semaphore:
+            file_record = await db.get_collection("files").find_one({"id": file_id})
         
         if not file_record:
             raise ValueError(f"File {file_id} not found")
@@ -104,7 +155,7 @@ class FileService:
     
     async def list_user_files(self, user_id: str) -> list:
         """List all files for a user"""
-        db = await get_mongodb()
+        db = await self._get_db()
         cursor = db.get_collection("files").find({"user_id": user_id})
         files = await cursor.to_list(length=100)
         
@@ -145,7 +196,7 @@ class FileService:
                         if sample_rows:
                             inventory_parts.append(f"      Sample Data:")
                             for row in sample_rows:
-                                inventory_parts.append(f"        {json.dumps(row)}")
+                                inventory_parts.append(f"        {_dump_row(row)}")
             
             elif file_info['type'] == '.csv':
                 if 'data' in processed:
@@ -159,7 +210,7 @@ class FileService:
                     if sample_rows:
                         inventory_parts.append(f"    Sample Data:")
                         for row in sample_rows:
-                            inventory_parts.append(f"      {json.dumps(row)}")
+                            inventory_parts.append(f"      {_dump_row(row)}")
             
             elif file_info['type'] == '.pdf':
                 if 'data' in processed:
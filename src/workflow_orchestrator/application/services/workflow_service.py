@@ -1,11 +1,19 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from ...domain.services.workflow_generator import WorkflowGenerator
 from ...domain.models import WorkflowGraph, AgentNode, Edge, ToolRequirement
-from ...infrastructure.database.mongodb import get_mongodb
+from ...infrastructure.database.mongodb import MongoDBClientMixin
+from pymongo import ReturnDocument
 from datetime import datetime
 import uuid
+import re
+import logging
 
-class WorkflowService:
+logger = logging.getLogger(__name__)
+
+_FILE_ID_PATTERN = re.compile(r'file_[a-z0-9]+')
+
+
+class WorkflowService(MongoDBClientMixin):
     """Application service for workflow operations"""
     
     def __init__(self):
@@ -19,9 +27,9 @@ class WorkflowService:
     ) -> WorkflowGraph:
         """Generate workflow from task description with file context"""
         
-        print(f"\n🔄 Generating workflow for task: {task_description}")
+        logger.info("🔄 Generating workflow for task: %s", task_description)
         if file_ids:
-            print(f"   Using files: {file_ids}")
+            logger.info("   Using files: %s", file_ids)
         
         # Generate using OpenAI with full context
         workflow_dict = await self.generator.generate_workflow(
@@ -53,7 +61,7 @@ class WorkflowService:
         )
         
         # Save to database (convert to dict for MongoDB)
-        db = await get_mongodb()
+        db = await self._get_db()
         workflow_data = workflow.model_dump()
         
         # Ensure edges are in correct format for storage
@@ -68,35 +76,29 @@ class WorkflowService:
         
         await db.get_collection("workflows").insert_one(workflow_data)
         
-        print(f"✅ Workflow generated: {workflow.id}")
-        print(f"   Agents: {len(workflow.agents)}")
+        logger.info("✅ Workflow generated: %s (%d agents)", workflow.id, len(workflow.agents))
         
         return workflow
     
     async def get_workflow(self, workflow_id: str) -> WorkflowGraph:
         """Get workflow by ID"""
-        db = await get_mongodb()
+        db = await self._get_db()
         workflow_dict = await db.get_collection("workflows").find_one({"id": workflow_id})
         
-        if not workflow_dict:
-            raise ValueError(f"Workflow {workflow_id} not found")
-        
-        # Remove MongoDB _id
-        if '_id' in workflow_dict:
-            del workflow_dict['_id']
-        
-        return WorkflowGraph(**workflow_dict)
+        return self._to_workflow_graph(workflow_id, workflow_dict)
     
     async def approve_workflow(self, workflow_id: str) -> WorkflowGraph:
         """Approve workflow for execution"""
-        db = await get_mongodb()
+        db = await self._get_db()
         
-        await db.get_collection("workflows").update_one(
+        # Update and read back in a single round-trip
+        workflow_dict = await db.get_collection("workflows").find_one_and_update(
             {"id": workflow_id},
-            {"$set": {"status": "approved"}}
+            {"$set": {"status": "approved"}},
+            return_document=ReturnDocument.AFTER
         )
         
-        return await self.get_workflow(workflow_id)
+        return self._to_workflow_graph(workflow_id, workflow_dict)
     
     async def modify_workflow(
         self,
@@ -109,15 +111,13 @@ class WorkflowService:
         workflow = await self.get_workflow(workflow_id)
         
         # Get files from original workflow
-        db = await get_mongodb()
+        db = await self._get_db()
         file_ids = []
         
         # Extract file IDs from agent prompts
         for agent in workflow.agents:
             if "file_id" in agent.detailed_prompt:
-                import re
-                matches = re.findall(r'file_[a-z0-9]+', agent.detailed_prompt)
-                file_ids.extend(matches)
+                file_ids.extend(_FILE_ID_PATTERN.findall(agent.detailed_prompt))
         
         file_ids = list(set(file_ids))
         
@@ -146,22 +146,38 @@ Generate an updated workflow that addresses the user's feedback.
             }
             normalized_edges.append(normalized_edge)
         
-        # Update existing workflow
-        await db.get_collection("workflows").update_one(
+        # Update existing workflow and read it back in a single round-trip
+        updated = await db.get_collection("workflows").find_one_and_update(
             {"id": workflow_id},
             {"$set": {
                 "agents": new_workflow_dict["agents"],
                 "edges": normalized_edges,
                 "description": new_workflow_dict["description"],
                 "status": "draft"
-            }}
+            }},
+            return_document=ReturnDocument.AFTER
         )
         
-        return await self.get_workflow(workflow_id)
+        return self._to_workflow_graph(workflow_id, updated)
+    
+    def _to_workflow_graph(
+        self,
+        workflow_id: str,
+        workflow_dict: Optional[Dict[str, Any]]
+    ) -> WorkflowGraph:
+        """Build WorkflowGraph from a MongoDB document"""
+        if not workflow_dict:
+            raise ValueError(f"Workflow {workflow_id} not found")
+        
+        # Remove MongoDB _id
+        if '_id' in workflow_dict:
+            del workflow_dict['_id']
+        
+        return WorkflowGraph(**workflow_dict)
     
     async def list_workflows(self, user_id: str) -> list:
         """List all workflows for a user"""
-        db = await get_mongodb()
+        db = await self._get_db()
         cursor = db.get_collection("workflows").find({"user_id": user_id})
         workflows = await cursor.to_list(length=100)
         
@@ -8,14 +8,29 @@ class Settings(BaseSettings):
     # App
     APP_NAME: str = "workflow-orchestrator"
     DEBUG: bool = True
+    LOG_LEVEL: str = "INFO"  # DEBUG adds per-step agent traces
     
     # OpenAI (System LLM)
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = "gpt-4-turbo"
+    AGENT_TEMPERATURE: float = 0.7
+    LLM_MAX_RETRIES: int = 3  # Client retries with backoff on rate limits / 5xx
+    LLM_REQUEST_TIMEOUT: float = 600.0  # Read timeout per LLM request (the OpenAI SDK default)
+    AGENT_MAX_EXECUTION_TIME: float = 60.0  # Seconds per tool-calling agent run
+    MAX_TOOL_PROVISION_CONCURRENCY: int = 8  # Concurrent tool setup calls across agents
+    MAX_CONCURRENT_AGENTS: int = 8  # In-flight agent runs across all workflows
+    LLM_CACHE_TTL: int = 3600  # Responses are only cached when temperature <= 0.1
+    LLM_PERSISTENT_CACHE_ENABLED: bool = False  # Also keep cached responses in MongoDB
+    LLM_PERSISTENT_CACHE_TTL: int = 86400
+    SEMANTIC_CACHE_ENABLED: bool = False  # Reuse responses for near-identical no-tool inputs
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Cosine similarity needed for a hit
     
     # MongoDB
     MONGODB_URL: str = "mongodb://localhost:27017"
     MONGODB_DB: str = "workflow_orchestrator"
+    MONGODB_POOL_SIZE: int = 100
+    MONGODB_MAX_CONCURRENCY: int = 50  # Keep below MONGODB_POOL_SIZE
+    MONGODB_COMPRESSORS: str = "zstd,snappy,zlib"  # Wire compression, in preference order
     
     # Vector DB
     DEFAULT_VECTOR_DB: str = "chromadb"  # chromadb | faiss
@@ -24,6 +39,8 @@ class Settings(BaseSettings):
     
     # Storage
     UPLOAD_DIR: str = "./data/uploads"
+    CODE_EXEC_TIMEOUT: int = 30  # Seconds per execute_python subprocess
+    PDF_EXTRACT_WORKERS: int = 4  # Processes for parallel text extraction of large PDFs
     
     # MCP
     SLACK_BOT_TOKEN: Optional[str] = None
@@ -1,10 +1,111 @@
 from openai import AsyncOpenAI
-import json
+import logging
+import orjson
 from typing import Dict, Any, List
 from ...config import settings
-from ...infrastructure.database.mongodb import get_mongodb
+from ...serialization import to_json
+from ...infrastructure.database.mongodb import MongoDBClientMixin
 
-class WorkflowGenerator:
+logger = logging.getLogger(__name__)
+
+
+# Static prompt text lives at module level; only the context slots are
+# filled in per request
+SYSTEM_PROMPT_TEMPLATE = """You are an expert workflow architect. You create multi-agent workflows with COMPLETE, EXECUTABLE details.
+
+CRITICAL RULES:
+1. Agent prompts MUST include EXACT file paths and column names
+2. Agent prompts MUST include STEP-BY-STEP executable instructions
+3. For code execution, provide COMPLETE working Python code
+4. Use ACTUAL data from files - don't make up column names
+5. Specify exact tool usage with parameters
+6. Define clear, parseable output formats
+
+AVAILABLE CONTEXT:
+
+FILES UPLOADED:
+{files_section}
+
+{tools_section}
+
+EXECUTION ENVIRONMENT:
+- Upload directory: {upload_directory}
+- File access: Enabled
+- Can save outputs: Yes
+
+AGENT TYPES & TEMPLATES:
+
+1. data_processor
+   - Use when: Need to load and process Excel/CSV files
+   - Tools: python_executor, filesystem
+   - Prompt must include: Exact file path, column names, pandas code
+
+2. rag_builder
+   - Use when: Need to index documents for semantic search
+   - Tools: chromadb or faiss, filesystem
+   - Prompt must include: File path, chunking strategy, metadata
+
+3. analyzer
+   - Use when: Need to analyze data from previous agent
+   - Tools: Based on requirements
+   - Prompt must include: Input structure, analysis steps
+   
+4. report_generator
+   - Use when: Generate final output/report
+   - Tools: filesystem, slack (optional)
+   - Prompt must include: Input structure, output format
+
+# Find this section and replace:
+OUTPUT JSON FORMAT:
+{{
+  "workflow_name": "Descriptive name",
+  "description": "What this workflow does",
+  "agents": [
+    {{
+      "id": "agent_1",
+      "type": "data_processor|rag_builder|analyzer|report_generator",
+      "name": "Clear agent name",
+      "task": "High-level task description",
+      "detailed_prompt": "COMPLETE prompt with file paths, column names, code, steps",
+      "required_tools": [
+        {{
+          "name": "python_executor|chromadb|faiss|filesystem|mongodb|slack",
+          "type": "code_execution|vector_db|mcp",
+          "purpose": "Why needed",
+          "config": {{}}
+        }}
+      ],
+      "inputs": ["agent_id" or "user_data"],
+      "outputs": ["output_key"],
+      "output_format": "JSON|Text|Markdown - be specific"
+    }}
+  ],
+  "edges": [
+    {{"from_agent": "agent_1", "to_agent": "agent_2", "data_key": "output_key"}}
+  ]
+}}
+
+REMEMBER:
+- Use ACTUAL file paths from the files list
+- Use ACTUAL column names from sample data
+- Provide EXECUTABLE code, not pseudocode
+- Be SPECIFIC about data structures"""
+
+USER_PROMPT_TEMPLATE = """USER TASK: {task_description}
+
+FILES AVAILABLE:
+{files_summary}
+
+Create a complete workflow that accomplishes this task using the available files and tools.
+
+IMPORTANT:
+- Include ALL file details (paths, columns) in agent prompts
+- Write EXECUTABLE Python code where needed
+- Specify exact tool parameters
+- Define clear data flow between agents"""
+
+
+class WorkflowGenerator(MongoDBClientMixin):
     """Generates multi-agent workflows with FULL CONTEXT"""
     
     def __init__(self):
@@ -26,12 +127,10 @@ class WorkflowGenerator:
         system_prompt = self._get_enhanced_system_prompt(context)
         user_prompt = self._get_enhanced_user_prompt(task_description, context)
         
-        print(f"\n{'='*80}")
-        print(f"📋 WORKFLOW GENERATION WITH FULL CONTEXT")
-        print(f"{'='*80}")
-        print(f"Files: {len(context['files'])}")
-        print(f"Available Tools: {len(context['available_tools'])}")
-        print(f"\nGenerating workflow...\n")
+        logger.info(
+            "📋 Generating workflow with full context (files: %d, tool groups: %d)",
+            len(context['files']), len(context['available_tools'])
+        )
         
         response = await self.client.chat.completions.create(
             model=self.model,
@@ -43,7 +142,7 @@ class WorkflowGenerator:
             temperature=0.7
         )
         
-        workflow_json = json.loads(response.choices[0].message.content)
+        workflow_json = orjson.loads(response.choices[0].message.content)
         
         # Enhance agent prompts with file context
         workflow = await self._enhance_agent_prompts_with_context(
@@ -60,13 +159,13 @@ class WorkflowGenerator:
     ) -> Dict[str, Any]:
         """Gather ALL context: files, tools, MCPs, vector DBs"""
         
-        db = await get_mongodb()
+        db = await self._get_db()
         
         # Get files
         files_data = []
         if file_ids:
-            for file_id in file_ids:
-                file_record = await db.get_collection("files").find_one({"id": file_id})
+            file_records = await db.find_by_ids("files", file_ids)
+            for file_record in file_records:
                 if file_record:
                     files_data.append(self._format_file_for_context(file_record))
         else:
@@ -168,7 +267,7 @@ class WorkflowGenerator:
                     # Show sample data
                     sample_rows = sheet_data.get('rows', [])[:3]
                     if sample_rows:
-                        file_str += f"\n    Sample Data: {json.dumps(sample_rows[:2], indent=6)}"
+                        file_str += f"\n    Sample Data: {to_json(sample_rows[:2])}"
             
             # Handle CSV files
             elif file['type'] == '.csv' and 'data' in processed_data:
@@ -179,7 +278,7 @@ class WorkflowGenerator:
                 # Show sample data
                 sample_rows = data.get('rows', [])[:3]
                 if sample_rows:
-                    file_str += f"\n  Sample Data: {json.dumps(sample_rows[:2], indent=4)}"
+                    file_str += f"\n  Sample Data: {to_json(sample_rows[:2])}"
             
             # Handle PDF files
             elif file['type'] == '.pdf' and 'data' in processed_data:
@@ -198,94 +297,20 @@ class WorkflowGenerator:
         # Format tools information
         tools_section = f"""
 VECTOR DATABASES:
-{json.dumps(context['available_tools']['vector_databases'], indent=2)}
+{to_json(context['available_tools']['vector_databases'])}
 
 MCP TOOLS:
-{json.dumps(context['available_tools']['mcps'], indent=2)}
+{to_json(context['available_tools']['mcps'])}
 
 CODE EXECUTION:
-{json.dumps(context['available_tools']['code_execution'], indent=2)}
+{to_json(context['available_tools']['code_execution'])}
 """
         
-        return f"""You are an expert workflow architect. You create multi-agent workflows with COMPLETE, EXECUTABLE details.
-
-CRITICAL RULES:
-1. Agent prompts MUST include EXACT file paths and column names
-2. Agent prompts MUST include STEP-BY-STEP executable instructions
-3. For code execution, provide COMPLETE working Python code
-4. Use ACTUAL data from files - don't make up column names
-5. Specify exact tool usage with parameters
-6. Define clear, parseable output formats
-
-AVAILABLE CONTEXT:
-
-FILES UPLOADED:
-{files_section}
-
-{tools_section}
-
-EXECUTION ENVIRONMENT:
-- Upload directory: {context['execution_context']['upload_directory']}
-- File access: Enabled
-- Can save outputs: Yes
-
-AGENT TYPES & TEMPLATES:
-
-1. data_processor
-   - Use when: Need to load and process Excel/CSV files
-   - Tools: python_executor, filesystem
-   - Prompt must include: Exact file path, column names, pandas code
-
-2. rag_builder
-   - Use when: Need to index documents for semantic search
-   - Tools: chromadb or faiss, filesystem
-   - Prompt must include: File path, chunking strategy, metadata
-
-3. analyzer
-   - Use when: Need to analyze data from previous agent
-   - Tools: Based on requirements
-   - Prompt must include: Input structure, analysis steps
-   
-4. report_generator
-   - Use when: Generate final output/report
-   - Tools: filesystem, slack (optional)
-   - Prompt must include: Input structure, output format
-
-# Find this section and replace:
-OUTPUT JSON FORMAT:
-{{
-  "workflow_name": "Descriptive name",
-  "description": "What this workflow does",
-  "agents": [
-    {{
-      "id": "agent_1",
-      "type": "data_processor|rag_builder|analyzer|report_generator",
-      "name": "Clear agent name",
-      "task": "High-level task description",
-      "detailed_prompt": "COMPLETE prompt with file paths, column names, code, steps",
-      "required_tools": [
-        {{
-          "name": "python_executor|chromadb|faiss|filesystem|mongodb|slack",
-          "type": "code_execution|vector_db|mcp",
-          "purpose": "Why needed",
-          "config": {{}}
-        }}
-      ],
-      "inputs": ["agent_id" or "user_data"],
-      "outputs": ["output_key"],
-      "output_format": "JSON|Text|Markdown - be specific"
-    }}
-  ],
-  "edges": [
-    {{"from_agent": "agent_1", "to_agent": "agent_2", "data_key": "output_key"}}
-  ]
-}}
-
-REMEMBER:
-- Use ACTUAL file paths from the files list
-- Use ACTUAL column names from sample data
-- Provide EXECUTABLE code, not pseudocode
-- Be SPECIFIC about data structures"""
+        return SYSTEM_PROMPT_TEMPLATE.format(
+            files_section=files_section,
+            tools_section=tools_section,
+            upload_directory=context['execution_context']['upload_directory']
+        )
     
     def _get_enhanced_user_prompt(
         self,
@@ -298,18 +323,10 @@ REMEMBER:
         for file in context["files"]:
             files_summary.append(f"- {file['filename']} ({file['type']})")
         
-        return f"""USER TASK: {task_description}
-
-FILES AVAILABLE:
-{chr(10).join(files_summary)}
-
-Create a complete workflow that accomplishes this task using the available files and tools.
-
-IMPORTANT:
-- Include ALL file details (paths, columns) in agent prompts
-- Write EXECUTABLE Python code where needed
-- Specify exact tool parameters
-- Define clear data flow between agents"""
+        return USER_PROMPT_TEMPLATE.format(
+            task_description=task_description,
+            files_summary="\n".join(files_summary)
+        )
     
     async def _enhance_agent_prompts_with_context(
         self,
@@ -321,9 +338,13 @@ IMPORTANT:
         # Already enhanced in main generation
         # This is a placeholder for additional processing if needed
         
-        print(f"\n✅ Generated {len(workflow['agents'])} agents:")
-        for agent in workflow["agents"]:
-            print(f"   - {agent['name']} ({agent['type']})")
-            print(f"     Tools: {[t['name'] for t in agent.get('required_tools', [])]}")
+        logger.info("✅ Generated %d agents", len(workflow['agents']))
+        if logger.isEnabledFor(logging.DEBUG):
+            for agent in workflow["agents"]:
+                logger.debug(
+                    "   - %s (%s) tools: %s",
+                    agent['name'], agent['type'],
+                    [t['name'] for t in agent.get('required_tools', [])]
+                )
         
         return workflow
\ No newline at end of file
@@ -1,16 +1,260 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Set, Tuple
+from collections import OrderedDict
 from langchain_openai import ChatOpenAI
+from langchain_core.agents import AgentAction
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import Tool
 from langchain_classic.agents import AgentExecutor, create_tool_calling_agent
-import json
+import asyncio
+import functools
+import httpx
+import io
+import logging
+import re
+import reprlib
+import sys
+import orjson
 
 from ..tools.tool_registry import ToolRegistry
 from ..tools.tool_implementations.vector_db_tools import create_vector_db_tools
 from ..tools.tool_implementations.code_executor_tools import create_code_executor_tool
 from ..tools.tool_implementations.file_tools import create_file_tools
 from ..tools.tool_implementations.mcp_tools import create_mcp_tools
+from ..llm.openai_client import OpenAIClient
+from ..llm.response_cache import (
+    LLMResponseCache,
+    PersistentResponseCache,
+    SemanticResponseCache,
+    CACHEABLE_MAX_TEMPERATURE
+)
 from ...config import settings
+from ...serialization import to_json, to_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# Receives output text chunks as the LLM produces them
+StreamCallback = Callable[[str], Awaitable[None]]
+
+
+# Upstream outputs beyond this many bytes are cut before reaching the prompt,
+# so one oversized tool result cannot blow up every downstream agent
+MAX_UPSTREAM_OUTPUT_BYTES = 100_000
+
+
+def _upstream_text(value: Any) -> str:
+    """Render a previous agent's output for the prompt, truncated if huge"""
+    if isinstance(value, (dict, list)):
+        data = to_json_bytes(value)
+    else:
+        text = str(value).strip()
+        if len(text) <= MAX_UPSTREAM_OUTPUT_BYTES // 4:
+            return text
+        data = text.encode()
+    
+    if len(data) <= MAX_UPSTREAM_OUTPUT_BYTES:
+        return data.decode()
+    
+    # Cut on bytes; drop a multi-byte character split at the boundary
+    kept = data[:MAX_UPSTREAM_OUTPUT_BYTES].decode(errors="ignore")
+    return f"{kept}\n... [truncated {len(data) - MAX_UPSTREAM_OUTPUT_BYTES} bytes]"
+
+
+# Bounded repr for log previews: large outputs are truncated while being
+# rendered instead of being stringified in full and then sliced
+_preview_repr = reprlib.Repr()
+_preview_repr.maxstring = 200
+_preview_repr.maxother = 200
+_preview_repr.maxlevel = 3
+
+
+def _preview(value: Any, limit: int = 200) -> str:
+    """Short preview of an agent output, with cost bounded by the limit"""
+    if isinstance(value, str):
+        return value[:limit]
+    return _preview_repr.repr(value)[:limit]
+
+
+def _table_preview(data: Dict[str, Any]) -> Tuple[str, str]:
+    """Column list and two-row sample for a table, as rendered by the processors"""
+    columns_text = data.get('columns_text')
+    if columns_text is None:
+        columns_text = ', '.join(map(str, data['columns']))
+    sample_text = data.get('sample_text')
+    if sample_text is None:
+        sample_text = orjson.dumps(data['rows'][:2], default=str).decode()
+    return columns_text, sample_text
+
+
+def render_files_block(files: List[Dict[str, Any]]) -> str:
+    """Render the AVAILABLE FILES section of the agent input
+    
+    Identical for every agent of a workflow run, so callers can render it
+    once and pass it along as input_data["files_block"].
+    """
+    if not files:
+        return ""
+    
+    buf = io.StringIO()
+    write = buf.write
+    write("AVAILABLE FILES:\n")
+    for file_info in sorted(files, key=lambda f: f['path']):
+        write(
+            f"\nFile: {file_info['filename']}\n"
+            f"  ID: {file_info['file_id']}\n"
+            f"  Path: {file_info['path']}\n"
+            f"  Type: {file_info['type']}\n"
+        )
+        
+        # Add structured data info for Excel/CSV
+        if 'sheets' in file_info:
+            for sheet_name, sheet_data in file_info['sheets'].items():
+                columns_text, sample_text = _table_preview(sheet_data)
+                write(
+                    f"  Sheet '{sheet_name}':\n"
+                    f"    Columns: {columns_text}\n"
+                    f"    Sample: {sample_text}\n"
+                )
+        elif 'data' in file_info:
+            columns_text, sample_text = _table_preview(file_info['data'])
+            write(
+                f"  Columns: {columns_text}\n"
+                f"  Sample: {sample_text}\n"
+            )
+    
+    write("\n")
+    return buf.getvalue()
+
+
+# Longer inputs exceed the embedding model's context; skip the semantic tier
+SEMANTIC_CACHE_MAX_CHARS = 8000
+
+_JSON_START_RE = re.compile(r"\s*[\[{]")
+_CODE_BLOCK_RE = re.compile(r"```(?P<lang>json|python)(?P<body>.*?)```", re.DOTALL)
+
+TOOL_DESCRIPTIONS_PROMPT = """{detailed_prompt}
+
+AVAILABLE TOOLS:
+{tools_desc}
+
+Note: You can reference these tools in your code or response, but execute the logic directly."""
+
+
+def _log_cache_usage(message: Any) -> None:
+    """Log prompt tokens served from the provider's prefix cache"""
+    usage = getattr(message, "usage_metadata", None)
+    if not usage:
+        return
+    cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    logger.debug("   Prompt tokens: %d (cached: %d)", usage.get("input_tokens", 0), cached)
+
+
+class AgentLoggingCallback(BaseCallbackHandler):
+    """Logs agent steps through the app logger instead of LangChain's verbose stdout"""
+    
+    def on_agent_action(self, action, **kwargs: Any) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   🔧 Tool call: %s(%.200s)", action.tool, action.tool_input)
+    
+    def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   📤 Tool output: %.200s", output)
+    
+    def on_agent_finish(self, finish, **kwargs: Any) -> None:
+        logger.debug("   🏁 Agent finished")
+    
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        if logger.isEnabledFor(logging.DEBUG):
+            for generations in response.generations:
+                for generation in generations:
+                    _log_cache_usage(getattr(generation, "message", None))
+
+
+_agent_logging_callback = AgentLoggingCallback()
+
+
+class AgentStalledError(RuntimeError):
+    """Raised when an agent keeps repeating the same tool call"""
+
+
+class StallDetectorCallback(BaseCallbackHandler):
+    """Stops an agent run that calls the same tool with the same input 3x in a row"""
+    
+    raise_error = True
+    run_inline = True
+    
+    def __init__(self):
+        self._last_call = None
+        self._repeats = 0
+    
+    def on_tool_start(self, serialized: Dict[str, Any], input_str: str, **kwargs: Any) -> None:
+        call = ((serialized or {}).get("name"), input_str)
+        if call != self._last_call:
+            self._last_call = call
+            self._repeats = 0
+            return
+        
+        self._repeats += 1
+        if self._repeats >= 2:
+            raise AgentStalledError(f"Agent stalled repeating tool call: {call[0]}")
+
+
+# Iteration budget: a couple of turns per tool, never above the hard cap
+MAX_AGENT_ITERATIONS = 15
+
+# Prompt templates and agent runnables are cached per detailed_prompt
+AGENT_CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=AGENT_CACHE_SIZE)
+def _build_tool_calling_prompt(system_text: str) -> ChatPromptTemplate:
+    """Build (once per distinct system prompt) the tool-calling agent prompt"""
+    # A literal message, not a template: generated prompts often contain
+    # JSON examples whose braces would be read as template variables
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=system_text),
+        ("human", "{input}"),
+        ("placeholder", "{agent_scratchpad}")
+    ])
+
+
+# Scratchpad pruning: keep the latest steps verbatim, fold the rest into
+# one short summary so each iteration doesn't resend the whole history
+MAX_VERBATIM_STEPS = 6
+MAX_STEP_SUMMARY_CHARS = 500
+
+
+def _trim_intermediate_steps(
+    steps: List[Tuple[AgentAction, str]]
+) -> List[Tuple[AgentAction, str]]:
+    """Summarize older agent steps into a single synthetic step"""
+    if len(steps) <= MAX_VERBATIM_STEPS:
+        return steps
+    
+    # Don't split parallel tool calls from one LLM turn: every tool call in
+    # a kept AI message still needs its tool result
+    keep_from = len(steps) - MAX_VERBATIM_STEPS
+    while keep_from > 0 and _same_llm_turn(steps[keep_from - 1][0], steps[keep_from][0]):
+        keep_from -= 1
+    if keep_from == 0:
+        return steps
+    
+    summary = "; ".join(
+        f"{action.tool}({str(action.tool_input)[:60]}) -> {str(observation)[:80]}"
+        for action, observation in steps[:keep_from]
+    )
+    summary = f"Earlier tool calls (summarized): {summary}"[:MAX_STEP_SUMMARY_CHARS]
+    
+    # A plain AgentAction is rendered to the model as an AI message with its log
+    summary_step = (AgentAction(tool="history_summary", tool_input="", log=summary), "")
+    return [summary_step, *steps[keep_from:]]
+
+
+def _same_llm_turn(a: AgentAction, b: AgentAction) -> bool:
+    """Check whether two actions came from the same LLM message"""
+    log_a = getattr(a, "message_log", None)
+    return bool(log_a) and log_a == getattr(b, "message_log", None)
 
 
 class DynamicAgentExecutor:
@@ -18,64 +262,115 @@ class DynamicAgentExecutor:
     
     def __init__(self):
         self.tool_registry = ToolRegistry()
+        # One warm connection pool shared by every LLM client, so concurrent
+        # agents multiplex over the same HTTP/2 connections
+        self._http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT, connect=5.0)
+        )
+        self._llm_cache: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._tool_calling_supported: Dict[Tuple[str, Tuple[str, ...]], bool] = {}
+        self._agent_cache: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+        self._response_cache = LLMResponseCache(ttl=settings.LLM_CACHE_TTL)
+        self._persistent_cache = None
+        if settings.LLM_PERSISTENT_CACHE_ENABLED:
+            self._persistent_cache = PersistentResponseCache(ttl=settings.LLM_PERSISTENT_CACHE_TTL)
+        self._pending_cleanups: Set[asyncio.Task] = set()
+        # Shared by all agents, so concurrent workflows can't flood the
+        # vector DBs / MCP servers with setup calls
+        self._tool_semaphore = asyncio.Semaphore(settings.MAX_TOOL_PROVISION_CONCURRENCY)
+        self._agent_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_AGENTS)
+        self._code_executor: Optional[Tool] = None
+        self._semantic_cache = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            self._semantic_cache = SemanticResponseCache(
+                embed=OpenAIClient().get_embedding,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                ttl=settings.LLM_CACHE_TTL
+            )
+    
+    def _get_llm(self, model: str, temperature: float) -> ChatOpenAI:
+        """Get a cached LLM client so its HTTP connection pool is reused"""
+        key = (model, temperature)
+        llm = self._llm_cache.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                model=model,
+                temperature=temperature,
+                max_retries=settings.LLM_MAX_RETRIES,
+                http_async_client=self._http_client
+            )
+            self._llm_cache[key] = llm
+        return llm
     
     async def execute_agent(
         self,
         agent_config: Dict[str, Any],
-        input_data: Any
+        input_data: Any,
+        stream_callback: Optional[StreamCallback] = None
     ) -> Dict[str, Any]:
-        """Execute a single agent with full context"""
+        """Execute a single agent with full context
+        
+        If stream_callback is given, output text is passed to it as it is
+        generated; the returned result is the same either way.
+        """
         
-        print(f"\n{'='*60}")
-        print(f"🤖 Executing Agent: {agent_config['name']}")
-        print(f"   Type: {agent_config['type']}")
-        print(f"{'='*60}")
+        logger.info("🤖 Executing Agent: %s (type: %s)", agent_config['name'], agent_config['type'])
+        
+        # Every successfully provisioned tool lands here as soon as it is
+        # ready, so cleanup also covers partial provisioning and cancellation
+        acquired_tools: List[Dict[str, Any]] = []
         
         try:
+            # Interned so concurrent runs of the same workflow share one copy
+            # of the prompt, and prompt cache lookups hit on identity. A
+            # missing or malformed prompt fails below like any other config
+            # error, as a failed result
+            detailed_prompt = agent_config.get("detailed_prompt")
+            if isinstance(detailed_prompt, str):
+                agent_config = {**agent_config, "detailed_prompt": sys.intern(detailed_prompt)}
+            
             # 1. Provision tools
             provisioned_tools = await self._provision_tools(
                 agent_id=agent_config["id"],
-                required_tools=agent_config.get("required_tools", [])
+                required_tools=agent_config.get("required_tools", []),
+                acquired=acquired_tools
             )
             
             # 2. Create LangChain tools
             langchain_tools = await self._create_langchain_tools(provisioned_tools)
             
-            print(f"   Tools available: {len(langchain_tools)}")
-            for tool in langchain_tools:
-                print(f"     - {tool.name}")
+            logger.info(
+                "   Tools available: %d (%s)",
+                len(langchain_tools), ", ".join(tool.name for tool in langchain_tools)
+            )
             
             # 3. Prepare comprehensive input
             agent_input = self._prepare_comprehensive_input(agent_config, input_data)
             
-            print(f"\n   Input prepared:")
-            print(f"     Files: {len(input_data.get('files', []))}")
+            logger.debug("   Input prepared: %d files", len(input_data.get('files', [])))
             
-            # 4. Create LLM
-            llm = ChatOpenAI(
-                api_key=settings.OPENAI_API_KEY,
-                model="gpt-4-turbo",
-                temperature=0.7
-            )
+            # 4. Get LLM
+            llm = self._get_llm(model="gpt-4-turbo", temperature=settings.AGENT_TEMPERATURE)
             
             # 5. Execute agent
             if langchain_tools:
                 output = await self._execute_with_tools(
-                    llm, langchain_tools, agent_config, agent_input
+                    llm, langchain_tools, agent_config, agent_input, stream_callback
                 )
             else:
                 output = await self._execute_without_tools(
-                    llm, agent_config, agent_input
+                    llm, agent_config, agent_input, stream_callback
                 )
             
             # 6. Parse output
-            parsed_output = self._parse_output(output)
+            parsed_output = await self._parse_output(output)
             
-            print(f"\n   ✅ Agent completed successfully")
-            print(f"   Output preview: {str(parsed_output)[:200]}...")
-            
-            # 7. Cleanup
-            await self.tool_registry.cleanup_tools(provisioned_tools)
+            logger.info("   ✅ Agent completed successfully")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("   Output preview: %s...", _preview(parsed_output))
             
             return {
                 "agent_id": agent_config["id"],
@@ -84,9 +379,11 @@ class DynamicAgentExecutor:
             }
             
         except Exception as e:
-            print(f"\n   ❌ Agent failed: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            # Only walk and format the traceback when someone will read it
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.exception("   ❌ Agent failed: %s", e)
+            else:
+                logger.error("   ❌ Agent failed: %s", e)
             
             return {
                 "agent_id": agent_config["id"],
@@ -94,250 +391,495 @@ class DynamicAgentExecutor:
                 "status": "failed",
                 "error": str(e)
             }
+        
+        finally:
+            # 7. Cleanup in the background so the caller can move on. The task
+            # is independent of this one, so cancelling the caller can't
+            # interrupt it midway
+            self._schedule_cleanup(acquired_tools)
+    
+    async def execute_agents_batch(
+        self,
+        batch: List[Tuple[Dict[str, Any], Any]]
+    ) -> List[Any]:
+        """Execute independent agents concurrently
+        
+        Takes (agent_config, input_data) pairs and returns results in the
+        same order; unexpected exceptions are returned, not raised. The
+        semaphore is shared, so concurrent workflows together stay within
+        MAX_CONCURRENT_AGENTS in-flight agents.
+        """
+        async def run(agent_config: Dict[str, Any], input_data: Any) -> Dict[str, Any]:
+            async with self._agent_semaphore:
+                return await self.execute_agent(agent_config, input_data)
+        
+        return await asyncio.gather(
+            *[run(agent_config, input_data) for agent_config, input_data in batch],
+            return_exceptions=True
+        )
+    
+    def _get_code_executor(self) -> Tool:
+        """Get the code executor tool, created once (it holds no per-run state)"""
+        if self._code_executor is None:
+            self._code_executor = create_code_executor_tool()
+        return self._code_executor
+    
+    def _schedule_cleanup(self, provisioned_tools: List[Dict[str, Any]]) -> None:
+        """Run tool cleanup as a tracked background task"""
+        if not provisioned_tools:
+            return
+        task = asyncio.create_task(self._cleanup(provisioned_tools))
+        self._pending_cleanups.add(task)
+        task.add_done_callback(self._pending_cleanups.discard)
+    
+    async def _cleanup(self, provisioned_tools: List[Dict[str, Any]]) -> None:
+        """Cleanup provisioned tools, logging instead of raising"""
+        try:
+            await self.tool_registry.cleanup_tools(provisioned_tools)
+        except Exception as e:
+            logger.warning("   ⚠️  Tool cleanup failed: %s", e)
+    
+    async def aclose(self) -> None:
+        """Wait for pending background cleanups and close the HTTP pools"""
+        if self._pending_cleanups:
+            await asyncio.gather(*self._pending_cleanups)
+        await self._http_client.aclose()
+        await self.tool_registry.aclose()
     
     async def _execute_with_tools(
         self,
         llm: ChatOpenAI,
-        tools: List[Tool],
+        tools: Tuple[Tool, ...],
         agent_config: Dict[str, Any],
-        agent_input: str
+        agent_input: str,
+        stream_callback: Optional[StreamCallback] = None
     ) -> str:
         """Execute agent with tools using tool calling"""
         
-        print(f"\n   🔄 Executing agent with {len(tools)} tools...\n")
+        logger.info("   🔄 Executing agent with %d tools...", len(tools))
         
-        # Create simple prompt for tool calling agent
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", agent_config["detailed_prompt"]),
-            ("human", "{input}"),
-            ("placeholder", "{agent_scratchpad}")
-        ])
+        # Constructing the agent fails deterministically for a given model and
+        # tool set, so remember failures instead of retrying them every run
+        tool_names = tuple(tool.name for tool in tools)
+        signature = (llm.model_name, tool_names)
+        agent = None
+        if self._tool_calling_supported.get(signature, True):
+            try:
+                agent = self._get_agent_runnable(llm, tools, agent_config["detailed_prompt"])
+            except (TypeError, ValueError, ImportError, AttributeError, NotImplementedError) as e:
+                self._tool_calling_supported[signature] = False
+                logger.warning("   ⚠️  Tool calling unavailable: %s", e)
         
-        try:
-            # Try tool calling agent (modern approach)
-            agent = create_tool_calling_agent(llm, tools, prompt)
-            
-            agent_executor = AgentExecutor(
-                agent=agent,
-                tools=tools,
-                verbose=True,
-                max_iterations=15,
-                handle_parsing_errors=True
-            )
-            
-            result = await agent_executor.ainvoke({"input": agent_input})
-            return result.get("output", str(result))
-            
-        except Exception as e:
-            print(f"   ⚠️  Tool calling failed: {e}")
-            print(f"   Falling back to direct LLM with tool descriptions...")
-            
-            # Fallback: Direct LLM call with tool descriptions
+        if agent is None:
+            logger.info("   Falling back to direct LLM with tool descriptions...")
             return await self._execute_with_tool_descriptions(
-                llm, tools, agent_config, agent_input
+                llm, tools, agent_config, agent_input, stream_callback
             )
+        
+        # API errors during the run are retried by the client (max_retries)
+        # rather than paying for a second, fallback LLM call
+        agent_executor = AgentExecutor(
+            agent=agent,
+            tools=tools,
+            max_iterations=min(MAX_AGENT_ITERATIONS, 2 + 2 * len(tools)),
+            max_execution_time=settings.AGENT_MAX_EXECUTION_TIME,
+            early_stopping_method="force",
+            handle_parsing_errors=True,
+            trim_intermediate_steps=_trim_intermediate_steps,
+            return_intermediate_steps=True
+        )
+        
+        # Passed via config so the callback is inherited by the LLM and
+        # tool runs, not just the executor itself
+        config = {"callbacks": [_agent_logging_callback, StallDetectorCallback()]}
+        if stream_callback is None:
+            result = await agent_executor.ainvoke({"input": agent_input}, config=config)
+        else:
+            result = await self._astream_agent(agent_executor, agent_input, config, stream_callback)
+        logger.debug("   Agent took %d steps", len(result.get("intermediate_steps", [])))
+        return result.get("output", str(result))
+    
+    def _get_agent_runnable(
+        self,
+        llm: ChatOpenAI,
+        tools: Tuple[Tool, ...],
+        detailed_prompt: str
+    ) -> Any:
+        """Get the tool-calling agent runnable, built once per prompt + tool set
+        
+        The runnable only carries the prompt and the bound tool schemas, so it
+        can be shared. The AgentExecutor is still built per run because it
+        holds the tools' functions, which close over per-run resources.
+        """
+        key = (
+            llm.model_name,
+            llm.temperature,
+            detailed_prompt,
+            tuple((tool.name, tool.description) for tool in tools)
+        )
+        agent = self._agent_cache.get(key)
+        if agent is not None:
+            self._agent_cache.move_to_end(key)
+            return agent
+        
+        # The static detailed_prompt leads and per-call input follows, so
+        # OpenAI's automatic prefix cache covers it on every turn
+        prompt = _build_tool_calling_prompt(detailed_prompt)
+        agent = create_tool_calling_agent(llm, tools, prompt)
+        
+        # Keyed by prompt, so bound it like the prompt cache (LRU)
+        self._agent_cache[key] = agent
+        if len(self._agent_cache) > AGENT_CACHE_SIZE:
+            self._agent_cache.popitem(last=False)
+        return agent
+    
+    async def _astream_agent(
+        self,
+        agent_executor: AgentExecutor,
+        agent_input: str,
+        config: Dict[str, Any],
+        stream_callback: StreamCallback
+    ) -> Dict[str, Any]:
+        """Run the agent, forwarding model tokens and returning the final result"""
+        result: Dict[str, Any] = {}
+        async for event in agent_executor.astream_events(
+            {"input": agent_input}, config=config, version="v2"
+        ):
+            if event["event"] == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    await stream_callback(content)
+            elif event["event"] == "on_chain_end" and not event["parent_ids"]:
+                # Root run finished: this is the AgentExecutor's output
+                result = event["data"]["output"]
+        return result
     
     async def _execute_with_tool_descriptions(
         self,
         llm: ChatOpenAI,
-        tools: List[Tool],
+        tools: Tuple[Tool, ...],
         agent_config: Dict[str, Any],
-        agent_input: str
+        agent_input: str,
+        stream_callback: Optional[StreamCallback] = None
     ) -> str:
         """Fallback: Execute with tool descriptions but no actual tool calling"""
         
-        # Build tool descriptions
+        # Build tool descriptions (tools arrive sorted by name, so the text
+        # is identical across calls)
         tools_desc = "\n\n".join([
             f"Tool: {tool.name}\nDescription: {tool.description}"
             for tool in tools
         ])
         
-        # Create enhanced prompt
-        full_prompt = f"""{agent_config["detailed_prompt"]}
-
-AVAILABLE TOOLS:
-{tools_desc}
-
-Note: You can reference these tools in your code or response, but execute the logic directly.
-
-INPUT:
-{agent_input}
-
-Provide your complete response:
-"""
+        # Static instructions go first as the system message so the request
+        # prefix is byte-identical across calls and eligible for provider-side
+        # prompt caching; only the human message varies per input
+        system_prompt = TOOL_DESCRIPTIONS_PROMPT.format(
+            detailed_prompt=agent_config["detailed_prompt"],
+            tools_desc=tools_desc
+        )
         
-        response = await llm.ainvoke([("human", full_prompt)])
-        return response.content
+        messages = [
+            ("system", system_prompt),
+            ("human", f"INPUT:\n{agent_input}\n\nProvide your complete response:")
+        ]
+        
+        return await self._ainvoke_cached(llm, messages, stream_callback)
     
     async def _execute_without_tools(
         self,
         llm: ChatOpenAI,
         agent_config: Dict[str, Any],
-        agent_input: str
+        agent_input: str,
+        stream_callback: Optional[StreamCallback] = None
     ) -> str:
         """Execute with simple LLM call (no tools)"""
         
-        print(f"\n   🔄 Executing with LLM (no tools)...\n")
+        logger.info("   🔄 Executing with LLM (no tools)...")
         
         messages = [
             ("system", agent_config["detailed_prompt"]),
             ("human", agent_input)
         ]
         
-        response = await llm.ainvoke(messages)
-        return response.content
+        return await self._ainvoke_cached(llm, messages, stream_callback)
+    
+    async def _ainvoke_cached(
+        self,
+        llm: ChatOpenAI,
+        messages: List[Tuple[str, str]],
+        stream_callback: Optional[StreamCallback] = None
+    ) -> str:
+        """Invoke LLM, reusing cached responses where allowed
+        
+        Exact-match reuse (in-process, then the optional MongoDB tier) is
+        limited to near-deterministic calls; the semantic tier is opt-in.
+        Only used for plain LLM calls; tool-calling agents have side
+        effects and are never served from cache.
+        """
+        key = None
+        if llm.temperature is not None and llm.temperature <= CACHEABLE_MAX_TEMPERATURE:
+            key = LLMResponseCache.make_key(llm.model_name, messages)
+            cached = await self._response_cache.get(key)
+            if cached is not None:
+                logger.info("   ♻️  Using cached LLM response")
+                if stream_callback is not None:
+                    await stream_callback(cached)
+                return cached
+            
+            cached = await self._persistent_get(key)
+            if cached is not None:
+                logger.info("   ♻️  Using persisted LLM response")
+                await self._response_cache.set(key, cached)
+                if stream_callback is not None:
+                    await stream_callback(cached)
+                return cached
+        
+        scope = embedding = None
+        if self._semantic_cache is not None:
+            scope, embedding = await self._semantic_lookup_key(llm, messages)
+            if embedding is not None:
+                cached = await self._semantic_cache.get(scope, embedding)
+                if cached is not None:
+                    logger.info("   ♻️  Using semantically cached LLM response")
+                    if stream_callback is not None:
+                        await stream_callback(cached)
+                    return cached
+        
+        content = await self._ainvoke(llm, messages, stream_callback)
+        
+        if key is not None:
+            await self._response_cache.set(key, content)
+            await self._persistent_set(key, content)
+        if embedding is not None:
+            await self._semantic_cache.set(scope, embedding, content)
+        return content
     
-    def _parse_output(self, output: str) -> Any:
+    async def _persistent_get(self, key: str) -> Optional[str]:
+        """Look up the MongoDB cache tier; failures count as a miss"""
+        if self._persistent_cache is None:
+            return None
+        try:
+            return await self._persistent_cache.get(key)
+        except Exception as e:
+            logger.warning("   ⚠️  Persistent LLM cache lookup failed: %s", e)
+            return None
+    
+    async def _persistent_set(self, key: str, content: str) -> None:
+        """Store in the MongoDB cache tier; failures are only logged"""
+        if self._persistent_cache is None:
+            return
+        try:
+            await self._persistent_cache.set(key, content)
+        except Exception as e:
+            logger.warning("   ⚠️  Persistent LLM cache write failed: %s", e)
+    
+    async def _ainvoke(
+        self,
+        llm: ChatOpenAI,
+        messages: List[Tuple[str, str]],
+        stream_callback: Optional[StreamCallback] = None
+    ) -> str:
+        """Invoke LLM, streaming chunks to the callback if one is given"""
+        if stream_callback is None:
+            response = await llm.ainvoke(messages)
+            _log_cache_usage(response)
+            return response.content
+        
+        parts = []
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                await stream_callback(chunk.content)
+        return "".join(parts)
+    
+    async def _semantic_lookup_key(
+        self,
+        llm: ChatOpenAI,
+        messages: List[Tuple[str, str]]
+    ) -> Tuple[Optional[str], Any]:
+        """Scope by model + system prompt, embed the final (input) message"""
+        text = messages[-1][1]
+        if len(text) > SEMANTIC_CACHE_MAX_CHARS:
+            return None, None
+        
+        scope = SemanticResponseCache.make_scope(llm.model_name, messages[0][1])
+        try:
+            return scope, await self._semantic_cache.embed_input(text)
+        except Exception as e:
+            # The cache is an optimization; never fail the agent over it
+            logger.warning("   ⚠️  Semantic cache lookup failed: %s", e)
+            return None, None
+    
+    async def _parse_output(self, output: str) -> Any:
         """Parse output, try to convert to JSON if possible"""
         
         if not isinstance(output, str):
             return output
         
-        output_stripped = output.strip()
-        
-        # Try to parse as JSON
-        if output_stripped.startswith('{') or output_stripped.startswith('['):
+        # Try to parse as JSON (checks the first non-whitespace char without
+        # copying the output; orjson tolerates the surrounding whitespace)
+        if _JSON_START_RE.match(output):
             try:
-                return json.loads(output_stripped)
-            except json.JSONDecodeError:
+                return orjson.loads(output)
+            except orjson.JSONDecodeError:
                 pass
         
-        # Try to extract JSON from markdown code blocks
-        if '```json' in output_stripped:
-            try:
-                json_start = output_stripped.index('```json') + 7
-                json_end = output_stripped.index('```', json_start)
-                json_str = output_stripped[json_start:json_end].strip()
-                return json.loads(json_str)
-            except (ValueError, json.JSONDecodeError):
-                pass
+        # Single pass over markdown code blocks: JSON blocks are returned
+        # directly, the first Python block is kept as a fallback
+        code = None
+        for block in _CODE_BLOCK_RE.finditer(output):
+            if block["lang"] == "json":
+                try:
+                    return orjson.loads(block["body"])
+                except orjson.JSONDecodeError:
+                    pass
+            elif code is None:
+                code = block["body"].strip()
         
-        # Try to extract Python code blocks and execute
-        if '```python' in output_stripped and 'python_executor' in str(output_stripped):
+        # Try to execute an extracted Python code block
+        if code is not None and 'python_executor' in output:
             try:
-                code_start = output_stripped.index('```python') + 9
-                code_end = output_stripped.index('```', code_start)
-                code = output_stripped[code_start:code_end].strip()
-                
                 # Execute the code
-                print(f"\n   🐍 Executing extracted Python code...")
-                from ..tools.tool_implementations.code_executor_tools import create_code_executor_tool
-                executor = create_code_executor_tool()
-                result = executor.func(code)
+                logger.info("   🐍 Executing extracted Python code...")
+                # The tool blocks on a subprocess, so wait for it on a
+                # worker thread; the subprocess enforces CODE_EXEC_TIMEOUT
+                # itself, this is only a backstop
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(self._get_code_executor().func, code),
+                    timeout=settings.CODE_EXEC_TIMEOUT + 5
+                )
                 
                 # Try to parse result as JSON
                 try:
-                    return json.loads(result.split("Code executed successfully:\n")[-1])
-                except:
+                    return orjson.loads(result.split("Code executed successfully:\n")[-1])
+                except orjson.JSONDecodeError:
                     return result
             except Exception as e:
-                print(f"   ⚠️  Code execution failed: {e}")
+                logger.warning("   ⚠️  Code execution failed: %s", e)
         
         return output
     
     async def _provision_tools(
         self,
         agent_id: str,
-        required_tools: List[Dict[str, Any]]
+        required_tools: List[Dict[str, Any]],
+        acquired: List[Dict[str, Any]]
     ) -> List[Dict[str, Any]]:
-        """Provision all required tools for agent"""
-        provisioned = []
+        """Provision all required tools for agent concurrently
         
-        for tool_req in required_tools:
-            try:
+        Each tool is also appended to acquired as soon as it is provisioned.
+        """
+        results = await asyncio.gather(*[
+            self._provision_one(agent_id, tool_req, acquired) for tool_req in required_tools
+        ])
+        
+        # gather preserves order, so tools stay in the order they were requested
+        return [tool_config for tool_config in results if tool_config is not None]
+    
+    async def _provision_one(
+        self,
+        agent_id: str,
+        tool_req: Dict[str, Any],
+        acquired: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Provision a single tool, returning None if it fails"""
+        try:
+            async with self._tool_semaphore:
                 tool_config = await self.tool_registry.provision_tool(
                     tool_name=tool_req["name"],
                     agent_id=agent_id,
                     purpose=tool_req.get("purpose", "task")
                 )
-                tool_config["spec"] = tool_req
-                provisioned.append(tool_config)
-                print(f"     ✅ Provisioned: {tool_req['name']}")
-            except Exception as e:
-                print(f"     ⚠️  Failed to provision {tool_req['name']}: {e}")
-        
-        return provisioned
+            acquired.append(tool_config)
+            tool_config["spec"] = tool_req
+            logger.info("     ✅ Provisioned: %s", tool_req['name'])
+            return tool_config
+        except Exception as e:
+            logger.warning("     ⚠️  Failed to provision %s: %s", tool_req['name'], e)
+            return None
     
     async def _create_langchain_tools(
         self,
         provisioned_tools: List[Dict[str, Any]]
-    ) -> List[Tool]:
-        """Convert provisioned tools to LangChain tools"""
-        tools = []
+    ) -> Tuple[Tool, ...]:
+        """Convert provisioned tools to LangChain tools concurrently"""
+        results = await asyncio.gather(*[
+            self._create_tools_for(prov_tool) for prov_tool in provisioned_tools
+        ])
         
-        for prov_tool in provisioned_tools:
-            try:
+        # Tool schemas are part of the request prefix, so keep them sorted by
+        # name to make it byte-identical across runs. Immutable, since the
+        # same sequence is shared by the agent, its executor and the fallback
+        return tuple(sorted(
+            (tool for tools in results for tool in tools),
+            key=lambda tool: tool.name
+        ))
+    
+    async def _create_tools_for(self, prov_tool: Dict[str, Any]) -> List[Tool]:
+        """Create LangChain tools for one provisioned tool"""
+        try:
+            if prov_tool["type"] == "code_execution":
+                return [self._get_code_executor()]
+            
+            async with self._tool_semaphore:
                 if prov_tool["type"] == "vector_db":
-                    vector_tools = await create_vector_db_tools(prov_tool)
-                    tools.extend(vector_tools)
-                
-                elif prov_tool["type"] == "code_execution":
-                    code_tool = create_code_executor_tool()
-                    tools.append(code_tool)
+                    return await create_vector_db_tools(prov_tool)
                 
                 elif prov_tool["type"] == "mcp" and prov_tool.get("available"):
-                    mcp_tools = await create_mcp_tools(prov_tool["client"])
-                    tools.extend(mcp_tools)
+                    return await create_mcp_tools(prov_tool["client"])
                 
                 elif prov_tool.get("spec", {}).get("name") == "filesystem":
-                    file_tools = await create_file_tools()
-                    tools.extend(file_tools)
-            
-            except Exception as e:
-                print(f"     ⚠️  Error creating tools for {prov_tool.get('type')}: {e}")
+                    return await create_file_tools()
+        
+        except Exception as e:
+            logger.warning("     ⚠️  Error creating tools for %s: %s", prov_tool.get('type'), e)
         
-        return tools
+        return []
     
     def _prepare_comprehensive_input(
         self,
         agent_config: Dict[str, Any],
         input_data: Any
     ) -> str:
-        """Prepare comprehensive input text for agent"""
-        
-        input_parts = []
-        
-        # Add task
-        input_parts.append(f"TASK: {agent_config.get('task', 'Execute assigned task')}")
-        input_parts.append("")
-        
-        # Add files context if present
-        if isinstance(input_data, dict) and "files" in input_data:
-            files = input_data["files"]
-            if files:
-                input_parts.append("AVAILABLE FILES:")
-                for file_info in files:
-                    input_parts.append(f"\nFile: {file_info['filename']}")
-                    input_parts.append(f"  ID: {file_info['file_id']}")
-                    input_parts.append(f"  Path: {file_info['path']}")
-                    input_parts.append(f"  Type: {file_info['type']}")
-                    
-                    # Add structured data info for Excel/CSV
-                    if 'sheets' in file_info:
-                        for sheet_name, sheet_data in file_info['sheets'].items():
-                            input_parts.append(f"  Sheet '{sheet_name}':")
-                            input_parts.append(f"    Columns: {', '.join(sheet_data['columns'])}")
-                            input_parts.append(f"    Sample: {json.dumps(sheet_data['rows'][:2])}")
-                    elif 'data' in file_info:
-                        input_parts.append(f"  Columns: {', '.join(file_info['data']['columns'])}")
-                        input_parts.append(f"  Sample: {json.dumps(file_info['data']['rows'][:2])}")
-                
-                input_parts.append("")
+        """Prepare comprehensive input text for agent
+        
+        Sections go from most to least stable (files, upstream outputs, task,
+        fresh input) in a fixed order, so repeated calls share the longest
+        possible prefix for provider-side prompt caching.
+        """
+        
+        buf = io.StringIO()
+        write = buf.write
+        is_dict = isinstance(input_data, dict)
         
-        # Add previous agent outputs
-        if isinstance(input_data, dict):
-            for key, value in input_data.items():
+        # 1. Files context, sorted by path. The orchestrator renders this once
+        # per workflow run (files_block); render it here only when absent
+        if is_dict:
+            files_block = input_data.get("files_block")
+            if files_block is None and input_data.get("files"):
+                files_block = render_files_block(input_data["files"])
+            if files_block:
+                write(files_block)
+        
+        # 2. Previous agent outputs, sorted by key
+        if is_dict:
+            for key in sorted(input_data):
                 if key.startswith("input_from_"):
-                    agent_name = key.replace("input_from_", "")
-                    input_parts.append(f"INPUT FROM {agent_name.upper()}:")
-                    input_parts.append(json.dumps(value, indent=2) if isinstance(value, (dict, list)) else str(value))
-                    input_parts.append("")
+                    value = input_data[key]
+                    agent_name = key[len("input_from_"):]
+                    write(f"INPUT FROM {agent_name.upper()}:\n")
+                    write(_upstream_text(value))
+                    write("\n\n")
+        
+        # 3. Task
+        write(f"TASK: {agent_config.get('task', 'Execute assigned task')}\n\n")
         
-        # If input_data is simple string or dict without special keys
+        # 4. Fresh input last: simple string or dict without special keys
         if isinstance(input_data, str):
-            input_parts.append(f"INPUT: {input_data}")
-        elif isinstance(input_data, dict) and not any(k in input_data for k in ['files', 'task']):
-            input_parts.append("INPUT DATA:")
-            input_parts.append(json.dumps(input_data, indent=2))
+            write(f"INPUT: {input_data.strip()}")
+        elif is_dict and not any(k in input_data for k in ['files', 'task']):
+            write("INPUT DATA:\n")
+            write(to_json(input_data))
         
-        return "\n".join(input_parts)
\ No newline at end of file
+        return buf.getvalue()
\ No newline at end of file
@@ -1,7 +1,11 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Optional
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
 from ...config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class MongoDB:
     """MongoDB database connection"""
@@ -9,42 +13,90 @@ class MongoDB:
     client: Optional[AsyncIOMotorClient] = None
     db = None
     
+    # Bounds in-flight operations from fan-out call sites so bursts queue
+    # here instead of exhausting the driver's connection pool
+    semaphore = asyncio.Semaphore(settings.MONGODB_MAX_CONCURRENCY)
+    
     async def connect(self):
         """Connect to MongoDB"""
         if self.client is None:
-            print(f"Connecting to MongoDB: {settings.MONGODB_URL}")
+            logger.info("Connecting to MongoDB: %s", settings.MONGODB_URL)
             
-            self.client = AsyncIOMotorClient(
+            client = AsyncIOMotorClient(
                 settings.MONGODB_URL,
                 serverSelectionTimeoutMS=5000,
-                connectTimeoutMS=10000
+                connectTimeoutMS=10000,
+                maxPoolSize=settings.MONGODB_POOL_SIZE,
+                minPoolSize=4,
+                maxIdleTimeMS=60000,
+                # Agent outputs are large JSON documents; compressors the
+                # driver can't load are skipped with a warning
+                compressors=settings.MONGODB_COMPRESSORS,
+                zlibCompressionLevel=6
             )
             
-            self.db = self.client[settings.MONGODB_DB]
+            # Test connection before publishing the client, so callers never
+            # see a half-initialized instance; a client that fails the ping
+            # is closed so its background pool doesn't leak across retries
+            try:
+                await client.admin.command('ping')
+            except Exception:
+                client.close()
+                raise
             
-            # Test connection
-            await self.client.admin.command('ping')
-            print(f"✅ Connected to MongoDB: {settings.MONGODB_DB}")
+            self.client = client
+            self.db = client[settings.MONGODB_DB]
+            logger.info("✅ Connected to MongoDB: %s", settings.MONGODB_DB)
     
     async def disconnect(self):
         """Disconnect from MongoDB"""
         if self.client:
             self.client.close()
-            print("✅ Disconnected from MongoDB")
+            logger.info("✅ Disconnected from MongoDB")
     
     def get_collection(self, name: str):
         """Get a collection"""
         if self.db is None:
             raise RuntimeError("Database not connected")
         return self.db[name]
+    
+    async def find_by_ids(self, name: str, ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Find documents by their "id" field, in the order given
+        
+        The lookups are independent, so they run concurrently (bounded by
+        the shared semaphore); missing documents come back as None.
+        """
+        collection = self.get_collection(name)
+        
+        async def find_one(doc_id: str) -> Optional[Dict[str, Any]]:
+            async with self.semaphore:
+                return await collection.find_one({"id": doc_id})
+        
+        return await asyncio.gather(*[find_one(doc_id) for doc_id in ids])
 
 
 # Global instance
 _mongodb = MongoDB()
+_connect_lock = asyncio.Lock()
 
 
 async def get_mongodb() -> MongoDB:
     """Get MongoDB instance"""
     if _mongodb.client is None:
-        await _mongodb.connect()
-    return _mongodb
\ No newline at end of file
+        # Concurrent first callers wait for one connect instead of racing
+        async with _connect_lock:
+            if _mongodb.client is None:
+                await _mongodb.connect()
+    return _mongodb
+
+
+class MongoDBClientMixin:
+    """For long-lived services: connects on first use and keeps the handle"""
+    
+    _db: Optional[MongoDB] = None
+    
+    async def _get_db(self) -> MongoDB:
+        """Get MongoDB handle, cached after the first call"""
+        if self._db is None:
+            self._db = await get_mongodb()
+        return self._db
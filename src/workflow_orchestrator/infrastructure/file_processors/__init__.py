@@ -1,20 +1,24 @@
 from .base import BaseFileProcessor
+from .tabular import TabularFileProcessor
 from .excel_processor import ExcelProcessor
 from .csv_processor import CSVProcessor
 from .pdf_processor import PDFProcessor
 
+# One shared instance per type is built at import; the tabular ones also
+# share their small cache of recently parsed files
+_excel_processor = ExcelProcessor()
+_PROCESSORS = {
+    '.xlsx': _excel_processor,
+    '.xls': _excel_processor,
+    '.csv': CSVProcessor(),
+    '.pdf': PDFProcessor()
+}
+
 class FileProcessorFactory:
     @staticmethod
     def get_processor(file_extension: str) -> BaseFileProcessor:
-        processors = {
-            '.xlsx': ExcelProcessor(),
-            '.xls': ExcelProcessor(),
-            '.csv': CSVProcessor(),
-            '.pdf': PDFProcessor()
-        }
-        
-        processor = processors.get(file_extension.lower())
+        processor = _PROCESSORS.get(file_extension.lower())
         if not processor:
             raise ValueError(f"Unsupported file type: {file_extension}")
         
-        return processor
\ No newline at end of file
+        return processor
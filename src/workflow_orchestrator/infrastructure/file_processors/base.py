@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 class BaseFileProcessor(ABC):
     """Base class for file processors"""
@@ -21,4 +21,12 @@ class BaseFileProcessor(ABC):
     @abstractmethod
     async def extract_text(self, file_path: str) -> str:
         """Extract text content from file"""
-        pass
\ No newline at end of file
+        pass
+    
+    async def process_with_text(self, file_path: str) -> Tuple[Dict[str, Any], str]:
+        """
+        Process file and extract its text content together
+        
+        Processors override this when both can come from one parse.
+        """
+        return await self.process(file_path), await self.extract_text(file_path)
\ No newline at end of file
@@ -1,66 +1,136 @@
 import pandas as pd
-from typing import Dict, Any
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from typing import Dict, Any, Tuple
 import numpy as np
-from datetime import datetime
 
+from .tabular import TabularFileProcessor, PREVIEW_ROWS
 
-class CSVProcessor:
+# Bytes per block for Arrow's streaming reader; blocks are parsed by
+# multiple threads and peak memory is bounded by a few blocks
+ARROW_BLOCK_BYTES = 8 << 20
+
+# Rows per chunk for the pandas fallback scan
+CSV_CHUNK_ROWS = 10_000
+
+
+class CSVProcessor(TabularFileProcessor):
     """Process CSV files"""
     
     async def process(self, file_path: str) -> Dict[str, Any]:
         """Process CSV file and extract structured data"""
         
-        # Read CSV
-        df = pd.read_csv(file_path)
+        # Scan CSV
+        head, total_rows, column_types = self._load(file_path, self._scan_csv)
         
         return {
             "type": "csv",
-            "data": {
-                "columns": df.columns.tolist(),
-                "rows": self._convert_to_serializable(df.to_dict('records')),
-                "summary": {
-                    "total_rows": len(df),
-                    "total_columns": len(df.columns),
-                    "column_types": {col: str(dtype) for col, dtype in df.dtypes.items()}
-                }
-            }
+            "data": self._table_data(head, total_rows=total_rows, column_types=column_types)
         }
     
     async def extract_text(self, file_path: str) -> str:
         """Extract text content from CSV for LLM context"""
         
-        df = pd.read_csv(file_path)
+        head, total_rows, _ = self._load(file_path, self._scan_csv)
         
         text_parts = [f"CSV File: {file_path.split('/')[-1]}"]
-        text_parts.append(f"Columns: {', '.join(df.columns.tolist())}")
-        text_parts.append(f"Rows: {len(df)}\n")
+        text_parts.append(f"Columns: {', '.join(map(str, head.columns))}")
+        text_parts.append(f"Rows: {total_rows}\n")
         
         # Add sample rows (first 5)
-        sample_rows = self._convert_to_serializable(df.head(5).to_dict('records'))
+        sample_rows = self._to_records(head)
         for i, row in enumerate(sample_rows, 1):
             text_parts.append(f"Row {i}: {row}")
         
         return "\n".join(text_parts)
     
-    def _convert_to_serializable(self, data: Any) -> Any:
-        """Convert pandas/numpy types to JSON-serializable Python types"""
-        if isinstance(data, dict):
-            return {key: self._convert_to_serializable(value) for key, value in data.items()}
-        elif isinstance(data, list):
-            return [self._convert_to_serializable(item) for item in data]
-        elif isinstance(data, pd.Timestamp):
-            return data.isoformat()
-        elif pd.isna(data):
-            return None
-        elif isinstance(data, (np.integer, np.int64, np.int32)):
-            return int(data)
-        elif isinstance(data, (np.floating, np.float64, np.float32)):
-            return float(data)
-        elif isinstance(data, np.ndarray):
-            return data.tolist()
-        elif isinstance(data, (np.bool_, bool)):
-            return bool(data)
-        elif isinstance(data, datetime):
-            return data.isoformat()
-        else:
-            return data
\ No newline at end of file
+    def _scan_csv(self, file_path: str) -> Tuple[pd.DataFrame, int, Dict[str, str]]:
+        """
+        Stream the CSV once, never holding the whole file
+        
+        Returns the first PREVIEW_ROWS rows, the total row count and the
+        column types.
+        """
+        try:
+            return self._scan_csv_arrow(file_path)
+        except pa.ArrowInvalid:
+            # Arrow fixes column types from the first block and rejects later
+            # values that don't fit; pandas widens types chunk by chunk
+            return self._scan_csv_pandas(file_path)
+    
+    def _scan_csv_arrow(self, file_path: str) -> Tuple[pd.DataFrame, int, Dict[str, str]]:
+        """Scan with Arrow's multithreaded C++ reader; only the head reaches pandas"""
+        head = None
+        total_rows = 0
+        # Arrow keeps duplicate and blank header names as they are, which
+        # collapses columns once they reach pandas; take the names pandas
+        # would give ("a.1", "Unnamed: 0") from its header-only read
+        column_names = pd.read_csv(file_path, nrows=0).columns.tolist()
+        read_options = pacsv.ReadOptions(
+            use_threads=True,
+            block_size=ARROW_BLOCK_BYTES,
+            column_names=column_names,
+            skip_rows=1
+        )
+        
+        # Arrow infers date/time/timestamp columns that pandas leaves as text,
+        # and BSON cannot store the date/time objects they convert to. The
+        # schema comes from the first block, so peek at it and pin those
+        # columns to strings
+        with pacsv.open_csv(file_path, read_options=read_options) as reader:
+            temporal = {
+                field.name: pa.string()
+                for field in reader.schema
+                if pa.types.is_temporal(field.type)
+            }
+        
+        with pacsv.open_csv(
+            file_path,
+            read_options=read_options,
+            # Empty fields are nulls, as in pandas
+            convert_options=pacsv.ConvertOptions(strings_can_be_null=True, column_types=temporal)
+        ) as reader:
+            for batch in reader:
+                if head is None and batch.num_rows:
+                    head = batch.slice(0, PREVIEW_ROWS)
+                total_rows += batch.num_rows
+            schema = reader.schema
+        
+        # Report types as pandas names, like the Excel processor does
+        empty = schema.empty_table().to_pandas()
+        column_types = {col: str(dtype) for col, dtype in empty.dtypes.items()}
+        
+        if head is None:  # Header only
+            return empty, 0, column_types
+        return pa.Table.from_batches([head]).to_pandas(), total_rows, column_types
+    
+    def _scan_csv_pandas(self, file_path: str) -> Tuple[pd.DataFrame, int, Dict[str, str]]:
+        """Scan in pandas chunks, widening column types across chunks"""
+        head = None
+        total_rows = 0
+        dtypes = {}
+        
+        with pd.read_csv(file_path, chunksize=CSV_CHUNK_ROWS) as reader:
+            for chunk in reader:
+                if head is None:
+                    head = chunk.head(PREVIEW_ROWS)
+                total_rows += len(chunk)
+                
+                # Each chunk infers its own types: widen numeric columns
+                # (e.g. int -> float once NaNs appear), otherwise fall back
+                # to object as a full read would
+                for col, dtype in chunk.dtypes.items():
+                    seen = dtypes.get(col)
+                    if seen is None:
+                        dtypes[col] = dtype
+                    elif seen != dtype:
+                        if pd.api.types.is_numeric_dtype(seen) and pd.api.types.is_numeric_dtype(dtype):
+                            dtypes[col] = np.result_type(seen, dtype)
+                        else:
+                            dtypes[col] = np.dtype(object)
+        
+        if head is None:  # Header only
+            head = pd.read_csv(file_path, nrows=0)
+            dtypes = dict(head.dtypes.items())
+        
+        return head, total_rows, {col: str(dtype) for col, dtype in dtypes.items()}
@@ -1,42 +1,173 @@
-from pypdf import PdfReader
-from typing import Dict, Any
+import pymupdf
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
+import asyncio
+import multiprocessing
 
+from .base import BaseFileProcessor
+from ...config import settings
 
-class PDFProcessor:
+# Below this many pages, worker start-up and pickling cost more than the
+# extraction itself
+PARALLEL_MIN_PAGES = 32
+
+# PyMuPDF holds the GIL while extracting, so large documents are split
+# across processes; the pool is created on first use
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Get the shared extraction pool"""
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: the server is multi-threaded (log listener,
+        # to_thread workers, driver threads) and a forked child can inherit
+        # a lock held by one of them
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the extraction workers, if any were started"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def _page_text(page: pymupdf.Page) -> str:
+    """Extract a page's text, skipping pages that cannot contain any"""
+    # Graphics-heavy pages spend nearly all parse time on path/fill
+    # operators. Page text only comes from BT blocks or from XObjects (Do),
+    # so a byte search of the decompressed content stream can rule it out.
+    # Annotations and form fields render their own appearance streams, so
+    # pages carrying any are always extracted
+    if page.first_annot is None and page.first_widget is None:
+        contents = page.read_contents()
+        if b"BT" not in contents and b"Do" not in contents:
+            return ""
+    return page.get_text()
+
+
+def _extract_pages(file_path: str, start: int = 0, stop: Optional[int] = None) -> List[str]:
+    """Extract the text of pages [start, stop) (PyMuPDF, C-backed)"""
+    with pymupdf.open(file_path) as doc:
+        return [_page_text(doc[i]) for i in range(start, doc.page_count if stop is None else stop)]
+
+
+def _count_or_extract(file_path: str) -> Tuple[int, Optional[List[str]]]:
+    """Page count, plus the page texts if the document is too small to parallelize
+    
+    Small documents are extracted in the same open that counts their pages.
+    """
+    with pymupdf.open(file_path) as doc:
+        if doc.page_count < PARALLEL_MIN_PAGES:
+            return doc.page_count, [_page_text(page) for page in doc]
+        return doc.page_count, None
+
+
+async def _iter_texts(file_path: str) -> AsyncIterator[str]:
+    """Yield page texts in page order as their ranges finish extracting"""
+    # Extraction is CPU-bound; keep it off the event loop. A document
+    # must not be shared between threads, so each call opens its own
+    page_count, texts = await asyncio.to_thread(_count_or_extract, file_path)
+    if texts is not None:
+        for text in texts:
+            yield text
+        return
+    
+    # One contiguous page range per worker, so each process opens the
+    # document once
+    step = -(-page_count // settings.PDF_EXTRACT_WORKERS)
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(_get_pool(), _extract_pages, file_path, start, min(start + step, page_count))
+        for start in range(0, page_count, step)
+    ]
+    try:
+        while futures:
+            # Release each range once yielded rather than holding them all
+            texts = await futures.pop(0)
+            for text in texts:
+                yield text
+            del texts
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+async def _extract_texts(file_path: str) -> List[str]:
+    """Extract all page texts, in page order"""
+    return [text async for text in _iter_texts(file_path)]
+
+
+class PDFProcessor(BaseFileProcessor):
     """Process PDF files"""
     
     async def process(self, file_path: str) -> Dict[str, Any]:
         """Process PDF file and extract text"""
         
-        reader = PdfReader(file_path)
+        texts = await _extract_texts(file_path)
+        return self._structured(texts)
+    
+    async def iter_pages(self, file_path: str) -> AsyncIterator[Tuple[int, str]]:
+        """Yield (page_number, text) for each page as it is extracted"""
+        
+        page_num = 0
+        async for text in _iter_texts(file_path):
+            page_num += 1
+            yield page_num, text
+    
+    async def extract_text(self, file_path: str) -> str:
+        """Extract all text from PDF for LLM context
+        
+        Pages are streamed into the output, without building the
+        per-page list that process() returns.
+        """
         
-        pages_data = []
-        for page_num, page in enumerate(reader.pages, 1):
-            text = page.extract_text()
-            pages_data.append({
+        text_parts = [f"PDF File: {file_path.split('/')[-1]}", ""]
+        total_pages = 0
+        async for page_num, text in self.iter_pages(file_path):
+            text_parts.extend((f"Page {page_num}:", text, "\n"))
+            total_pages = page_num
+        text_parts[1] = f"Total Pages: {total_pages}\n"
+        
+        return "\n".join(text_parts)
+    
+    async def process_with_text(self, file_path: str) -> Tuple[Dict[str, Any], str]:
+        """Process PDF file and extract its text from a single extraction"""
+        
+        texts = await _extract_texts(file_path)
+        return self._structured(texts), self._render_text(file_path, texts)
+    
+    def _structured(self, texts: List[str]) -> Dict[str, Any]:
+        """Structured per-page data"""
+        pages_data = [
+            {
                 "page_number": page_num,
                 "text": text,
                 "char_count": len(text)
-            })
+            }
+            for page_num, text in enumerate(texts, 1)
+        ]
         
         return {
             "type": "pdf",
             "data": {
-                "total_pages": len(reader.pages),
+                "total_pages": len(texts),
                 "pages": pages_data
             }
         }
     
-    async def extract_text(self, file_path: str) -> str:
-        """Extract all text from PDF for LLM context"""
-        
-        reader = PdfReader(file_path)
-        
+    def _render_text(self, file_path: str, texts: List[str]) -> str:
+        """Text content for LLM context"""
         text_parts = [f"PDF File: {file_path.split('/')[-1]}"]
-        text_parts.append(f"Total Pages: {len(reader.pages)}\n")
+        text_parts.append(f"Total Pages: {len(texts)}\n")
         
-        for page_num, page in enumerate(reader.pages, 1):
-            text = page.extract_text()
+        for page_num, text in enumerate(texts, 1):
             text_parts.append(f"Page {page_num}:")
             text_parts.append(text)
             text_parts.append("\n")
@@ -0,0 +1,142 @@
+import pandas as pd
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+import orjson
+import os
+from datetime import date, datetime, time
+
+from .base import BaseFileProcessor
+
+# infer_dtype results for object columns whose values are already
+# JSON-serializable, so the column can skip the per-value converter
+_NATIVE_INFERRED_TYPES = frozenset({"string", "empty"})
+
+# Rows kept from the top of each table; previews use at most this many
+PREVIEW_ROWS = 5
+
+# Scanned files kept for a follow-up call on the same file (uploads run
+# process() then extract_text())
+PARSED_CACHE_SIZE = 4
+
+
+class TabularFileProcessor(BaseFileProcessor):
+    """Shared helpers for DataFrame-backed processors (Excel, CSV)"""
+    
+    def __init__(self):
+        self._parsed_cache: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+    
+    @staticmethod
+    def _cache_key(file_path: str) -> Tuple[str, int, int]:
+        """Key a file by path and its current mtime/size, so edits invalidate"""
+        stat = os.stat(file_path)
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _load(self, file_path: str, parse: Callable[[str], Any]) -> Any:
+        """Parse a file, reusing the result of a recent parse of the same file"""
+        key = self._cache_key(file_path)
+        parsed = self._parsed_cache.get(key)
+        if parsed is None:
+            parsed = parse(file_path)
+            self._parsed_cache[key] = parsed
+            while len(self._parsed_cache) > PARSED_CACHE_SIZE:
+                self._parsed_cache.popitem(last=False)
+        
+        self._parsed_cache.move_to_end(key)
+        return parsed
+    
+    def _table_data(
+        self,
+        df: pd.DataFrame,
+        total_rows: Optional[int] = None,
+        column_types: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Structured data for one table (a CSV file or an Excel sheet)
+        
+        The column list and two-row sample shown in agent prompts are
+        rendered here once per file instead of on every agent call.
+        Processors pass only the head of the table (PREVIEW_ROWS) along
+        with the totals of the whole file.
+        """
+        columns = df.columns.tolist()
+        rows = self._to_records(df)
+        if column_types is None:
+            column_types = {col: str(dtype) for col, dtype in df.dtypes.items()}
+        return {
+            "columns": columns,
+            "rows": rows,
+            "columns_text": ", ".join(map(str, columns)),
+            "sample_text": orjson.dumps(rows[:2], default=str).decode(),
+            "summary": {
+                "total_rows": len(df) if total_rows is None else total_rows,
+                "total_columns": len(columns),
+                "column_types": column_types
+            }
+        }
+    
+    def _to_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Convert a DataFrame to JSON-serializable records column by column
+        
+        Typed columns are converted in one pass each instead of walking
+        every cell; only object columns holding non-string values still
+        need the per-value converter.
+        """
+        # Keyed by position so duplicate column names survive the rebuild
+        columns = {}
+        for position in range(df.shape[1]):
+            series = df.iloc[:, position]
+            if pd.api.types.is_datetime64_any_dtype(series):
+                values = series.map(pd.Timestamp.isoformat, na_action='ignore')
+            elif series.dtype == object:
+                # One Cython-level type scan; text columns (the common case)
+                # pass through, others convert only their non-null cells
+                if pd.api.types.infer_dtype(series, skipna=True) in _NATIVE_INFERRED_TYPES:
+                    values = series
+                else:
+                    values = series.map(self._convert_to_serializable, na_action='ignore')
+            else:
+                values = series
+            
+            # astype(object) unwraps numpy scalars to Python ints/floats/bools
+            columns[position] = values.astype(object).where(series.notna(), None)
+        
+        converted = pd.DataFrame(columns, index=df.index)
+        converted.columns = df.columns
+        return converted.to_dict('records')
+    
+    def _convert_to_serializable(self, data: Any) -> Any:
+        """
+        Convert pandas/numpy types to JSON-serializable Python types
+        
+        Handles:
+        - pd.Timestamp, datetime/date/time -> str
+        - pd.NaT -> None
+        - np.int64 -> int
+        - np.float64 -> float
+        - np.nan -> None
+        - Nested structures (lists, dicts)
+        """
+        if isinstance(data, str):
+            return data
+        elif isinstance(data, dict):
+            return {key: self._convert_to_serializable(value) for key, value in data.items()}
+        elif isinstance(data, list):
+            return [self._convert_to_serializable(item) for item in data]
+        elif isinstance(data, pd.Timestamp):
+            return data.isoformat()
+        elif pd.isna(data):  # Handles pd.NaT, np.nan, None
+            return None
+        elif isinstance(data, (np.integer, np.int64, np.int32)):
+            return int(data)
+        elif isinstance(data, (np.floating, np.float64, np.float32)):
+            return float(data)
+        elif isinstance(data, np.ndarray):
+            return data.tolist()
+        elif isinstance(data, (np.bool_, bool)):
+            return bool(data)
+        elif isinstance(data, (datetime, date, time)):
+            return data.isoformat()
+        else:
+            return data
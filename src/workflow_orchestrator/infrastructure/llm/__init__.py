@@ -1 +1,2 @@
-from .openai_client import OpenAIClient
\ No newline at end of file
+from .openai_client import OpenAIClient
+from .response_cache import LLMResponseCache, PersistentResponseCache, SemanticResponseCache
\ No newline at end of file
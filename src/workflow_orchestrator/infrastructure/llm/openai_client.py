@@ -1,23 +1,175 @@
 from openai import AsyncOpenAI
-from typing import List
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import functools
+import hashlib
+import numpy as np
+import tiktoken
 from ...config import settings
 
+# Embeddings API limits for text-embedding-3-*
+MAX_INPUT_TOKENS = 8191
+MAX_REQUEST_INPUTS = 2048
+MAX_REQUEST_TOKENS = 300_000
+
+
+def _cache_key(text: str) -> bytes:
+    """Fixed-size cache key, so long documents aren't held twice in memory"""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> tiktoken.Encoding:
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _fit_input(text: str) -> Tuple[str, int]:
+    """Truncate text to the per-input token limit
+    
+    Returns the text and an upper bound of its token count.
+    """
+    # A token spans at least one byte, so short texts skip tokenizing
+    size = len(text.encode())
+    if size <= MAX_INPUT_TOKENS:
+        return text, size
+    
+    tokens = _encoding().encode_ordinary(text)
+    if len(tokens) <= MAX_INPUT_TOKENS:
+        return text, len(tokens)
+    return _encoding().decode(tokens[:MAX_INPUT_TOKENS]), MAX_INPUT_TOKENS
+
+
+def _split_requests(fitted: List[Tuple[str, int]]) -> List[List[str]]:
+    """Group inputs into requests within the per-request input/token limits"""
+    requests: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text, tokens in fitted:
+        if current and (len(current) == MAX_REQUEST_INPUTS or current_tokens + tokens > MAX_REQUEST_TOKENS):
+            requests.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        requests.append(current)
+    return requests
+
+
 class OpenAIClient:
     """OpenAI client for embeddings"""
     
+    EMBEDDING_MODEL = "text-embedding-3-small"
+    EMBEDDING_DIMENSIONS = 1536
+    
+    # Single-text requests arriving within this window share one API call
+    BATCH_WINDOW = 0.01
+    MAX_BATCH_SIZE = 128
+    
+    # Shared across instances: vector DB tools create a client per agent,
+    # and the same queries/documents recur across agents and iterations.
+    # Stored as float16: 3 KB per vector instead of ~43 KB of Python floats
+    _embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+    _embedding_cache_size = 10_000
+    
+    # Micro-batcher state, also shared so concurrent agents batch together
+    _pending: Dict[str, asyncio.Future] = {}
+    _flush_handle: Optional[asyncio.TimerHandle] = None
+    _flush_tasks: Set[asyncio.Task] = set()
+    
     def __init__(self):
         self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
     
-    async def get_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts"""
-        response = await self.client.embeddings.create(
-            model="text-embedding-3-small",
-            input=texts
-        )
+    async def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for texts, only requesting ones not cached
+        
+        Returns a float32 array of shape (len(texts), dimensions). Inputs
+        over the model's token limit are truncated, and large batches are
+        split into concurrent requests within the API limits.
+        """
+        if not texts:
+            return np.empty((0, self.EMBEDDING_DIMENSIONS), dtype=np.float32)
+        
+        cache = self._embedding_cache
+        keys = {text: _cache_key(text) for text in texts}
+        found = {text: cache[key] for text, key in keys.items() if key in cache}
+        missing = [text for text in keys if text not in found]
         
-        return [item.embedding for item in response.data]
+        if missing:
+            # Tokenizing long documents is CPU work; keep it off the loop
+            fitted = await asyncio.to_thread(lambda: [_fit_input(text) for text in missing])
+            responses = await asyncio.gather(*[
+                self.client.embeddings.create(model=self.EMBEDDING_MODEL, input=batch)
+                for batch in _split_requests(fitted)
+            ])
+            fresh = np.asarray(
+                [item.embedding for response in responses for item in response.data],
+                dtype=np.float16
+            )
+            found.update(zip(missing, fresh))
+        
+        # Refresh recency, then evict least recently used entries
+        for text, embedding in found.items():
+            key = keys[text]
+            cache[key] = embedding
+            cache.move_to_end(key)
+        while len(cache) > self._embedding_cache_size:
+            cache.popitem(last=False)
+        
+        # Fresh and cached vectors both come from float16, so results don't
+        # depend on whether they were cached
+        return np.stack([found[text] for text in texts]).astype(np.float32)
     
-    async def get_embedding(self, text: str) -> List[float]:
-        """Generate embedding for single text"""
-        embeddings = await self.get_embeddings([text])
-        return embeddings[0]
\ No newline at end of file
+    async def get_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for single text
+        
+        Cache misses are queued briefly and sent together with other
+        single-text requests in one embeddings call.
+        """
+        key = _cache_key(text)
+        cache = self._embedding_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key].astype(np.float32)
+        
+        cls = type(self)
+        future = cls._pending.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            cls._pending[text] = future
+            if len(cls._pending) >= self.MAX_BATCH_SIZE:
+                self._flush()
+            elif cls._flush_handle is None:
+                cls._flush_handle = loop.call_later(self.BATCH_WINDOW, self._flush)
+        
+        # Shielded: the future is shared, one caller's cancellation must
+        # not cancel it for the others
+        return await asyncio.shield(future)
+    
+    def _flush(self) -> None:
+        """Send all queued texts as one batch"""
+        cls = type(self)
+        if cls._flush_handle is not None:
+            cls._flush_handle.cancel()
+            cls._flush_handle = None
+        
+        batch, cls._pending = cls._pending, {}
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._resolve(batch))
+            cls._flush_tasks.add(task)
+            task.add_done_callback(cls._flush_tasks.discard)
+    
+    async def _resolve(self, batch: Dict[str, asyncio.Future]) -> None:
+        """Fetch a batch and hand each waiter its embedding (or the error)"""
+        try:
+            embeddings = await self.get_embeddings(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for future, embedding in zip(batch.values(), embeddings):
+            if not future.done():
+                future.set_result(embedding)
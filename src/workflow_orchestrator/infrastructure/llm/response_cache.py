@@ -0,0 +1,186 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import asyncio
+import hashlib
+import time
+import numpy as np
+import orjson
+from ..database.mongodb import get_mongodb
+
+# Above this temperature responses are intentionally varied, so caching
+# would change behaviour rather than just skip repeated work
+CACHEABLE_MAX_TEMPERATURE = 0.1
+
+
+class LLMResponseCache:
+    """In-process TTL cache for LLM responses keyed by a hash of the request"""
+    
+    def __init__(self, ttl: int = 3600, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(model: str, messages: Any) -> str:
+        """Build cache key from model name and rendered messages"""
+        payload = orjson.dumps(
+            {"model": model, "messages": messages},
+            option=orjson.OPT_SORT_KEYS
+        )
+        # Not security sensitive; blake2b is faster than sha256 on long prompts
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get cached response, or None if missing/expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Store response"""
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class PersistentResponseCache:
+    """MongoDB-backed TTL cache for LLM responses, shared across restarts
+    
+    Uses the same keys as LLMResponseCache and sits behind it as a second
+    tier. Expired documents are removed by a TTL index on expires_at.
+    """
+    
+    COLLECTION = "llm_cache"
+    
+    def __init__(self, ttl: int = 86400):
+        self.ttl = ttl
+        self._index_lock = asyncio.Lock()
+        self._index_ready = False
+        self.hits = 0
+        self.misses = 0
+    
+    async def _collection(self):
+        """Get the cache collection, creating the TTL index on first use"""
+        db = await get_mongodb()
+        collection = db.get_collection(self.COLLECTION)
+        if not self._index_ready:
+            async with self._index_lock:
+                if not self._index_ready:
+                    await collection.create_index("expires_at", expireAfterSeconds=0)
+                    self._index_ready = True
+        return collection
+    
+    async def get(self, key: str) -> Optional[str]:
+        """Get cached response, or None if missing/expired"""
+        collection = await self._collection()
+        # The TTL monitor runs about once a minute, so filter expiry here too
+        doc = await collection.find_one(
+            {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+            {"value": 1}
+        )
+        if doc is None:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return doc["value"]
+    
+    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> None:
+        """Store response"""
+        collection = await self._collection()
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl or self.ttl)
+        await collection.update_one(
+            {"_id": key},
+            {"$set": {"value": value, "expires_at": expires_at}},
+            upsert=True
+        )
+
+
+class SemanticResponseCache:
+    """In-process TTL cache that reuses responses for near-identical inputs
+    
+    Entries are scoped by model + system prompt; within a scope the input
+    embedding is compared by cosine similarity against stored inputs.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[np.ndarray]],
+        threshold: float = 0.95,
+        ttl: int = 3600,
+        max_entries_per_scope: int = 256,
+        max_scopes: int = 256
+    ):
+        self.embed = embed
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries_per_scope = max_entries_per_scope
+        self.max_scopes = max_scopes
+        # Least recently used scope first
+        self._scopes: "OrderedDict[str, List[Tuple[float, np.ndarray, str]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_scope(model: str, system_prompt: str) -> str:
+        """Build scope key from model name and system prompt"""
+        return hashlib.sha256(f"{model}\0{system_prompt}".encode()).hexdigest()
+    
+    async def embed_input(self, text: str) -> np.ndarray:
+        """Embed input text as a unit vector"""
+        # The embedder returns a 1-D float32 array (no copy here); divide
+        # into a new array rather than in place, as it may be shared
+        vector = np.asarray(await self.embed(text), dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector.copy()
+    
+    async def get(self, scope: str, embedding: np.ndarray) -> Optional[str]:
+        """Get the response of the most similar cached input above threshold"""
+        now = time.monotonic()
+        entries = [entry for entry in self._scopes.get(scope, []) if entry[0] >= now]
+        if entries:
+            self._scopes[scope] = entries
+            self._scopes.move_to_end(scope)
+        else:
+            # Fully expired (or never stored): don't keep an empty scope
+            self._scopes.pop(scope, None)
+        
+        if entries:
+            similarities = np.stack([entry[1] for entry in entries]) @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                self.hits += 1
+                return entries[best][2]
+        
+        self.misses += 1
+        return None
+    
+    async def set(self, scope: str, embedding: np.ndarray, value: str) -> None:
+        """Store response for an embedded input"""
+        entries = self._scopes.setdefault(scope, [])
+        self._scopes.move_to_end(scope)
+        entries.append((time.monotonic() + self.ttl, embedding, value))
+        
+        # Oldest entries are first
+        if len(entries) > self.max_entries_per_scope:
+            del entries[:len(entries) - self.max_entries_per_scope]
+        
+        # Every distinct agent prompt is a scope; evict least recently used
+        while len(self._scopes) > self.max_scopes:
+            self._scopes.popitem(last=False)
@@ -1,36 +1,119 @@
 """Filesystem MCP - Complete Implementation"""
+import asyncio
 import os
-import aiofiles
-from typing import Dict, Any, List
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
 from ...config import settings
 
+
+def _write_text(full_path: Path, content: str) -> None:
+    """Create parent directories and write the file (runs on a worker thread)"""
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    full_path.write_text(content, encoding='utf-8')
+
+
+def _list_dir(full_path: Path) -> List[str]:
+    """List entry names with a single scandir pass (runs on a worker thread)"""
+    with os.scandir(full_path) as entries:
+        return [entry.name for entry in entries]
+
+
+# Tool schemas are static, so they are built once at import
+_TOOLS: Tuple[Dict[str, Any], ...] = (
+    {
+        "name": "read_file",
+        "description": "Read contents of a file",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "filepath": {"type": "string", "description": "Path to file"}
+            },
+            "required": ["filepath"]
+        }
+    },
+    {
+        "name": "read_files",
+        "description": "Read contents of several files at once",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "filepaths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Paths to files"
+                }
+            },
+            "required": ["filepaths"]
+        }
+    },
+    {
+        "name": "write_file",
+        "description": "Write content to a file",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "filepath": {"type": "string"},
+                "content": {"type": "string"}
+            },
+            "required": ["filepath", "content"]
+        }
+    },
+    {
+        "name": "list_files",
+        "description": "List files in a directory",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "directory": {"type": "string", "default": "."}
+            }
+        }
+    }
+)
+
+
 class FilesystemMCP:
     """Filesystem MCP for file operations"""
     
     def __init__(self):
         self.base_path = settings.UPLOAD_DIR
+        # Resolved once; every operation is checked against it
+        self._base_path = Path(self.base_path).resolve()
         self.connected = True
     
+    def _resolve(self, filepath: str) -> Path:
+        """Resolve a path under the base directory, rejecting traversal out of it"""
+        full_path = (self._base_path / filepath).resolve()
+        if not full_path.is_relative_to(self._base_path):
+            raise ValueError(f"Path is outside the upload directory: {filepath}")
+        return full_path
+    
     async def read_file(self, filepath: str) -> str:
         """Read file contents"""
         try:
-            full_path = os.path.join(self.base_path, filepath)
-            async with aiofiles.open(full_path, 'r') as f:
-                content = await f.read()
-            return content
+            full_path = self._resolve(filepath)
+            # One worker-thread hop for open + read + close
+            return await asyncio.to_thread(full_path.read_text, encoding='utf-8')
         except Exception as e:
             return f"Error reading file: {str(e)}"
     
+    async def read_files(self, filepaths: List[str], concurrency: int = 32) -> Dict[str, str]:
+        """Read several files concurrently, keyed by filepath in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def read_one(filepath: str) -> str:
+            async with semaphore:
+                return await self.read_file(filepath)
+        
+        # read_file reports errors in its result, so one bad path doesn't
+        # fail the batch
+        contents = await asyncio.gather(*[read_one(filepath) for filepath in filepaths])
+        return dict(zip(filepaths, contents))
+    
     async def write_file(self, filepath: str, content: str) -> str:
         """Write content to file"""
         try:
-            full_path = os.path.join(self.base_path, filepath)
-            
-            # Create directory if needed
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            
-            async with aiofiles.open(full_path, 'w') as f:
-                await f.write(content)
+            full_path = self._resolve(filepath)
+            await asyncio.to_thread(_write_text, full_path, content)
             
             return f"Successfully wrote to {filepath}"
         except Exception as e:
@@ -39,60 +122,28 @@ class FilesystemMCP:
     async def list_files(self, directory: str = ".") -> List[str]:
         """List files in directory"""
         try:
-            full_path = os.path.join(self.base_path, directory)
-            files = os.listdir(full_path)
-            return files
+            full_path = self._resolve(directory)
+            return await asyncio.to_thread(_list_dir, full_path)
         except Exception as e:
             return [f"Error: {str(e)}"]
     
     async def delete_file(self, filepath: str) -> str:
         """Delete a file"""
         try:
-            full_path = os.path.join(self.base_path, filepath)
-            os.remove(full_path)
+            full_path = self._resolve(filepath)
+            await asyncio.to_thread(full_path.unlink)
             return f"Successfully deleted {filepath}"
         except Exception as e:
             return f"Error deleting file: {str(e)}"
     
     async def file_exists(self, filepath: str) -> bool:
         """Check if file exists"""
-        full_path = os.path.join(self.base_path, filepath)
-        return os.path.exists(full_path)
+        try:
+            full_path = self._resolve(filepath)
+        except ValueError:
+            return False
+        return full_path.exists()
     
-    def get_tools(self) -> List[Dict[str, Any]]:
-        """Get available tools"""
-        return [
-            {
-                "name": "read_file",
-                "description": "Read contents of a file",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "filepath": {"type": "string", "description": "Path to file"}
-                    },
-                    "required": ["filepath"]
-                }
-            },
-            {
-                "name": "write_file",
-                "description": "Write content to a file",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "filepath": {"type": "string"},
-                        "content": {"type": "string"}
-                    },
-                    "required": ["filepath", "content"]
-                }
-            },
-            {
-                "name": "list_files",
-                "description": "List files in a directory",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "directory": {"type": "string", "default": "."}
-                    }
-                }
-            }
-        ]
\ No newline at end of file
+    def get_tools(self) -> Tuple[Dict[str, Any], ...]:
+        """Get available tools (shared; do not mutate)"""
+        return _TOOLS
\ No newline at end of file
@@ -1,8 +1,40 @@
 """MongoDB MCP - Complete Implementation"""
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional, Tuple
+from bson import json_util
 from motor.motor_asyncio import AsyncIOMotorClient
 from ...config import settings
-import json
+import asyncio
+
+# Tool schemas are static, so they are built once at import
+_TOOLS: Tuple[Dict[str, Any], ...] = (
+    {
+        "name": "insert_document",
+        "description": "Insert a document into MongoDB collection",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "collection": {"type": "string"},
+                "document": {"type": "object"}
+            },
+            "required": ["collection", "document"]
+        }
+    },
+    {
+        "name": "find_documents",
+        "description": "Find documents in MongoDB collection",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "collection": {"type": "string"},
+                "query": {"type": "object"},
+                "projection": {"type": "object", "description": "Fields to include, e.g. {\"name\": 1}"},
+                "limit": {"type": "integer", "default": 10}
+            },
+            "required": ["collection", "query"]
+        }
+    }
+)
+
 
 class MongoDBMCP:
     """MongoDB MCP for database operations"""
@@ -20,18 +52,23 @@ class MongoDBMCP:
         except Exception as e:
             return f"Error inserting document: {str(e)}"
     
-    async def find_documents(self, collection: str, query: Dict[str, Any], limit: int = 10) -> str:
-        """Find documents"""
+    async def find_documents(
+        self,
+        collection: str,
+        query: Dict[str, Any],
+        limit: int = 10,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Find documents, optionally returning only the projected fields"""
         try:
-            cursor = self.db[collection].find(query).limit(limit)
+            cursor = self.db[collection].find(query, projection).limit(limit)
             documents = await cursor.to_list(length=limit)
             
-            # Convert ObjectId to string
-            for doc in documents:
-                if '_id' in doc:
-                    doc['_id'] = str(doc['_id'])
-            
-            return json.dumps(documents, indent=2)
+            # json_util handles ObjectId, datetime and other BSON types;
+            # compact output, serialized off the event loop
+            return await asyncio.to_thread(
+                json_util.dumps, documents, json_options=json_util.RELAXED_JSON_OPTIONS
+            )
         except Exception as e:
             return f"Error finding documents: {str(e)}"
     
@@ -51,32 +88,6 @@ class MongoDBMCP:
         except Exception as e:
             return f"Error deleting documents: {str(e)}"
     
-    def get_tools(self) -> List[Dict[str, Any]]:
-        """Get available tools"""
-        return [
-            {
-                "name": "insert_document",
-                "description": "Insert a document into MongoDB collection",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "collection": {"type": "string"},
-                        "document": {"type": "object"}
-                    },
-                    "required": ["collection", "document"]
-                }
-            },
-            {
-                "name": "find_documents",
-                "description": "Find documents in MongoDB collection",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "collection": {"type": "string"},
-                        "query": {"type": "object"},
-                        "limit": {"type": "integer", "default": 10}
-                    },
-                    "required": ["collection", "query"]
-                }
-            }
-        ]
\ No newline at end of file
+    def get_tools(self) -> Tuple[Dict[str, Any], ...]:
+        """Get available tools (shared; do not mutate)"""
+        return _TOOLS
\ No newline at end of file
@@ -1,14 +1,45 @@
 """Slack MCP - Complete Implementation"""
-from typing import Dict, Any, List
+from typing import Dict, Any, Tuple
 import httpx
 from ...config import settings
 
+# Tool schemas are static, so they are built once at import
+_TOOLS: Tuple[Dict[str, Any], ...] = (
+    {
+        "name": "send_slack_message",
+        "description": "Send a message to a Slack channel",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "channel": {"type": "string", "description": "Channel ID or name"},
+                "text": {"type": "string", "description": "Message text"}
+            },
+            "required": ["channel", "text"]
+        }
+    },
+)
+
+
 class SlackMCP:
     """Slack MCP for notifications"""
     
     def __init__(self):
         self.bot_token = settings.SLACK_BOT_TOKEN
         self.connected = bool(self.bot_token)
+        
+        # One pooled client for all messages, so bursts reuse the TLS
+        # connection instead of handshaking per call
+        self._client = httpx.AsyncClient(
+            base_url="https://slack.com/api",
+            headers={"Authorization": f"Bearer {self.bot_token}"},
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool"""
+        await self._client.aclose()
     
     async def send_message(self, channel: str, text: str) -> str:
         """Send message to Slack channel"""
@@ -16,35 +47,20 @@ class SlackMCP:
             return "Slack not configured (no bot token)"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://slack.com/api/chat.postMessage",
-                    headers={"Authorization": f"Bearer {self.bot_token}"},
-                    json={"channel": channel, "text": text}
-                )
-                
-                result = response.json()
-                if result.get("ok"):
-                    return f"Message sent successfully to {channel}"
-                else:
-                    return f"Error: {result.get('error', 'Unknown error')}"
+            response = await self._client.post(
+                "/chat.postMessage",
+                json={"channel": channel, "text": text}
+            )
+            
+            result = response.json()
+            if result.get("ok"):
+                return f"Message sent successfully to {channel}"
+            else:
+                return f"Error: {result.get('error', 'Unknown error')}"
         
         except Exception as e:
             return f"Error sending message: {str(e)}"
     
-    def get_tools(self) -> List[Dict[str, Any]]:
-        """Get available tools"""
-        return [
-            {
-                "name": "send_slack_message",
-                "description": "Send a message to a Slack channel",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "channel": {"type": "string", "description": "Channel ID or name"},
-                        "text": {"type": "string", "description": "Message text"}
-                    },
-                    "required": ["channel", "text"]
-                }
-            }
-        ]
\ No newline at end of file
+    def get_tools(self) -> Tuple[Dict[str, Any], ...]:
+        """Get available tools (shared; do not mutate)"""
+        return _TOOLS
\ No newline at end of file
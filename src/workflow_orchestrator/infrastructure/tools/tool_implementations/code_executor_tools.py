@@ -3,6 +3,7 @@ import sys
 from io import StringIO
 import traceback
 import subprocess
+import tempfile
 import os
 from ....config import settings
 
@@ -16,11 +17,15 @@ def create_code_executor_tool() -> Tool:
         - Common libraries (pandas, numpy, etc.)
         - Output capture
         """
+        script_path = None
         try:
-            # Create a temporary script file
-            script_path = os.path.join(settings.UPLOAD_DIR, "temp_script.py")
-            
-            with open(script_path, 'w') as f:
+            # One script file per call: agents run code concurrently, so a
+            # shared file would be overwritten or removed under another run.
+            # Absolute, as the script runs with cwd set to the upload dir
+            with tempfile.NamedTemporaryFile(
+                'w', dir=os.path.abspath(settings.UPLOAD_DIR), prefix="temp_script_", suffix=".py", delete=False
+            ) as f:
+                script_path = f.name
                 f.write(code)
             
             # Execute with subprocess for better isolation
@@ -32,15 +37,11 @@ def create_code_executor_tool() -> Tool:
                 [sys.executable, script_path],
                 capture_output=True,
                 text=True,
-                timeout=30,
+                timeout=settings.CODE_EXEC_TIMEOUT,
                 env=env,
                 cwd=settings.UPLOAD_DIR  # Run from upload directory
             )
             
-            # Cleanup
-            if os.path.exists(script_path):
-                os.remove(script_path)
-            
             if result.returncode == 0:
                 output = result.stdout
                 return f"Code executed successfully:\n{output}" if output else "Code executed successfully (no output)"
@@ -48,10 +49,14 @@ def create_code_executor_tool() -> Tool:
                 return f"Error executing code:\n{result.stderr}"
         
         except subprocess.TimeoutExpired:
-            return "Error: Code execution timed out (30s limit)"
+            return f"Error: Code execution timed out ({settings.CODE_EXEC_TIMEOUT}s limit)"
         except Exception as e:
             error_trace = traceback.format_exc()
             return f"Error executing code:\n{error_trace}"
+        finally:
+            # Cleanup, also after a timeout
+            if script_path and os.path.exists(script_path):
+                os.remove(script_path)
     
     return Tool(
         name="execute_python",
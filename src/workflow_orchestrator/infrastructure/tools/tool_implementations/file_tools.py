@@ -1,6 +1,7 @@
 from langchain_core.tools import Tool
 from typing import List
-import aiofiles
+from pathlib import Path
+import asyncio
 import os
 from ....config import settings
 
@@ -11,9 +12,8 @@ async def create_file_tools() -> List[Tool]:
         """Read file contents"""
         try:
             full_path = os.path.join(settings.UPLOAD_DIR, filepath)
-            async with aiofiles.open(full_path, 'r') as f:
-                content = await f.read()
-            return content
+            # One worker-thread hop for open + read + close
+            return await asyncio.to_thread(Path(full_path).read_text, encoding='utf-8')
         except Exception as e:
             return f"Error reading file: {str(e)}"
     
@@ -30,8 +30,7 @@ async def create_file_tools() -> List[Tool]:
             filepath, content = parts
             full_path = os.path.join(settings.UPLOAD_DIR, filepath)
             
-            async with aiofiles.open(full_path, 'w') as f:
-                await f.write(content)
+            await asyncio.to_thread(Path(full_path).write_text, content, encoding='utf-8')
             
             return f"Successfully wrote to {filepath}"
         except Exception as e:
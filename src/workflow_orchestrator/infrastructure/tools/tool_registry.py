@@ -4,8 +4,26 @@ from ..mcp.filesystem_mcp import FilesystemMCP
 from ..mcp.mongodb_mcp import MongoDBMCP
 from ..mcp.slack_mcp import SlackMCP
 from ...domain.models import ToolRequirement
+import asyncio
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+# Static catalogue of provisionable tools, built once at import
+AVAILABLE_TOOLS: Dict[str, Dict[str, str]] = {
+    "chromadb": {"type": "vector_db", "description": "Embedded vector database for semantic search"},
+    "faiss": {"type": "vector_db", "description": "Fast in-memory vector search"},
+    "filesystem": {"type": "mcp", "description": "File read/write operations"},
+    "mongodb": {"type": "mcp", "description": "Database CRUD operations"},
+    "slack": {"type": "mcp", "description": "Send Slack notifications"},
+    "python_executor": {"type": "code_execution", "description": "Execute Python code"}
+}
+
+_TOOL_DESCRIPTIONS = "\n".join(
+    f"- {name}: {info['description']}" for name, info in AVAILABLE_TOOLS.items()
+)
+
 class ToolRegistry:
     """Registry for all available tools and provisioning"""
     
@@ -17,14 +35,7 @@ class ToolRegistry:
             "slack": SlackMCP()
         }
         
-        self.available_tools = {
-            "chromadb": {"type": "vector_db", "description": "Embedded vector database for semantic search"},
-            "faiss": {"type": "vector_db", "description": "Fast in-memory vector search"},
-            "filesystem": {"type": "mcp", "description": "File read/write operations"},
-            "mongodb": {"type": "mcp", "description": "Database CRUD operations"},
-            "slack": {"type": "mcp", "description": "Send Slack notifications"},
-            "python_executor": {"type": "code_execution", "description": "Execute Python code"}
-        }
+        self.available_tools = AVAILABLE_TOOLS
     
     async def provision_tool(
         self,
@@ -34,11 +45,10 @@ class ToolRegistry:
     ) -> Dict[str, Any]:
         """Provision a tool for an agent"""
         
-        if tool_name not in self.available_tools:
+        tool_info = self.available_tools.get(tool_name)
+        if tool_info is None:
             raise ValueError(f"Tool {tool_name} not available")
         
-        tool_info = self.available_tools[tool_name]
-        
         if tool_info["type"] == "vector_db":
             return await self._provision_vector_db(tool_name, agent_id, purpose)
         elif tool_info["type"] == "mcp":
@@ -85,16 +95,25 @@ class ToolRegistry:
     
     def get_tool_descriptions(self) -> str:
         """Get formatted list of available tools"""
-        descriptions = []
-        for name, info in self.available_tools.items():
-            descriptions.append(f"- {name}: {info['description']}")
-        return "\n".join(descriptions)
+        return _TOOL_DESCRIPTIONS
+    
+    async def aclose(self) -> None:
+        """Close MCP clients that hold network connections"""
+        await asyncio.gather(*[
+            client.aclose() for client in self.mcp_clients.values() if hasattr(client, "aclose")
+        ])
     
     async def cleanup_tools(self, provisioned_tools: List[Dict[str, Any]]) -> None:
-        """Cleanup provisioned resources"""
-        for tool in provisioned_tools:
-            if tool.get("cleanup_required") and tool["type"] == "vector_db":
-                store = tool["store"]
-                collection_name = tool["collection_name"]
-                await store.delete_collection(collection_name)
-                print(f"✅ Cleaned up {tool['db_type']} collection: {collection_name}")
\ No newline at end of file
+        """Cleanup provisioned resources concurrently"""
+        await asyncio.gather(*[
+            self._cleanup_tool(tool)
+            for tool in provisioned_tools
+            if tool.get("cleanup_required") and tool["type"] == "vector_db"
+        ])
+    
+    async def _cleanup_tool(self, tool: Dict[str, Any]) -> None:
+        """Delete a provisioned vector DB collection"""
+        store = tool["store"]
+        collection_name = tool["collection_name"]
+        await store.delete_collection(collection_name)
+        logger.info("✅ Cleaned up %s collection: %s", tool['db_type'], collection_name)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any
+import numpy as np
 
 class BaseVectorStore(ABC):
     """Abstract base for vector stores"""
@@ -14,20 +15,20 @@ class BaseVectorStore(ABC):
         self,
         collection_name: str,
         documents: List[str],
-        embeddings: List[List[float]],
+        embeddings: np.ndarray,
         metadatas: List[Dict[str, Any]]
     ) -> None:
-        """Add documents with embeddings"""
+        """Add documents with their embeddings, a float32 array of shape (n, d)"""
         pass
     
     @abstractmethod
     async def search(
         self,
         collection_name: str,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
-        """Search for similar documents"""
+        """Search for documents similar to a 1-D float32 query embedding"""
         pass
     
     @abstractmethod
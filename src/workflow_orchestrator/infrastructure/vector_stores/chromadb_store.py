@@ -1,10 +1,14 @@
 import chromadb
 from chromadb.config import Settings as ChromaSettings
 from typing import List, Dict, Any
+import numpy as np
 import uuid
+import logging
 from .base import BaseVectorStore
 from ...config import settings
 
+logger = logging.getLogger(__name__)
+
 class ChromaDBStore(BaseVectorStore):
     """ChromaDB implementation"""
     
@@ -28,7 +32,7 @@ class ChromaDBStore(BaseVectorStore):
         self,
         collection_name: str,
         documents: List[str],
-        embeddings: List[List[float]],
+        embeddings: np.ndarray,
         metadatas: List[Dict[str, Any]]
     ) -> None:
         collection = self.client.get_collection(collection_name)
@@ -44,7 +48,7 @@ class ChromaDBStore(BaseVectorStore):
     async def search(
         self,
         collection_name: str,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
         collection = self.client.get_collection(collection_name)
@@ -71,4 +75,4 @@ class ChromaDBStore(BaseVectorStore):
         try:
             self.client.delete_collection(collection_name)
         except Exception as e:
-            print(f"Error deleting collection {collection_name}: {e}")
\ No newline at end of file
+            logger.warning("Error deleting collection %s: %s", collection_name, e)
\ No newline at end of file
@@ -18,7 +18,9 @@ class FAISSStore(BaseVectorStore):
     async def create_collection(self, name: str, dimension: int = 1536) -> str:
         collection_name = f"{name}_{uuid.uuid4().hex[:8]}"
         
-        index = faiss.IndexFlatL2(dimension)
+        # Vectors are unit-normalized on insert, so similarity is a plain
+        # dot product (single BLAS sgemv over the index)
+        index = faiss.IndexFlatIP(dimension)
         
         self.indexes[collection_name] = {
             "index": index,
@@ -33,7 +35,7 @@ class FAISSStore(BaseVectorStore):
         self,
         collection_name: str,
         documents: List[str],
-        embeddings: List[List[float]],
+        embeddings: np.ndarray,
         metadatas: List[Dict[str, Any]]
     ) -> None:
         if collection_name not in self.indexes:
@@ -41,7 +43,8 @@ class FAISSStore(BaseVectorStore):
         
         collection = self.indexes[collection_name]
         
-        embeddings_array = np.array(embeddings).astype('float32')
+        embeddings_array = np.array(embeddings, dtype='float32')
+        faiss.normalize_L2(embeddings_array)
         collection["index"].add(embeddings_array)
         
         collection["documents"].extend(documents)
@@ -50,7 +53,7 @@ class FAISSStore(BaseVectorStore):
     async def search(
         self,
         collection_name: str,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         top_k: int = 5
     ) -> List[Dict[str, Any]]:
         if collection_name not in self.indexes:
@@ -58,16 +61,18 @@ class FAISSStore(BaseVectorStore):
         
         collection = self.indexes[collection_name]
         
-        query_array = np.array([query_embedding]).astype('float32')
-        distances, indices = collection["index"].search(query_array, top_k)
+        query_array = np.array([query_embedding], dtype='float32')
+        faiss.normalize_L2(query_array)
+        similarities, indices = collection["index"].search(query_array, top_k)
         
         results = []
-        for idx, dist in zip(indices[0], distances[0]):
-            if idx < len(collection["documents"]):
+        for idx, sim in zip(indices[0], similarities[0]):
+            if 0 <= idx < len(collection["documents"]):
                 results.append({
                     "document": collection["documents"][idx],
                     "metadata": collection["metadatas"][idx],
-                    "distance": float(dist)
+                    # Squared L2 between unit vectors, same scale as before
+                    "distance": float(2.0 - 2.0 * sim)
                 })
         
         return results
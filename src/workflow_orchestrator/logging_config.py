@@ -0,0 +1,41 @@
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from .config import settings
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def setup_logging() -> None:
+    """Route application logs through a queue so writes happen off the event loop"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+    
+    # The listener thread does the actual (blocking) stream writes
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    
+    _queue_handler = QueueHandler(log_queue)
+    app_logger = logging.getLogger("workflow_orchestrator")
+    app_logger.addHandler(_queue_handler)
+    app_logger.setLevel(settings.LOG_LEVEL.upper())
+    app_logger.propagate = False
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger("workflow_orchestrator").removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
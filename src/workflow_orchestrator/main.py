@@ -3,16 +3,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from .config import settings
+from .logging_config import setup_logging, shutdown_logging
 from .infrastructure.database.mongodb import get_mongodb
+from .infrastructure.file_processors.pdf_processor import shutdown_pool as shutdown_pdf_pool
 
 from .api.routes.workflows import router as workflows_router
-from .api.routes.executions import router as executions_router
+from .api.routes.executions import router as executions_router, execution_service
 from .api.routes.files import router as files_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
+    setup_logging()
+    
     print(f"\n{'='*60}")
     print(f"🚀 Starting {settings.APP_NAME}")
     print(f"{'='*60}\n")
@@ -34,6 +38,12 @@ async def lifespan(app: FastAPI):
     print(f"\n{'='*60}")
     print(f"👋 Shutting down {settings.APP_NAME}")
     print(f"{'='*60}\n")
+    
+    # Finish background tool cleanups, stop PDF extraction workers, then
+    # flush queued log records
+    await execution_service.aclose()
+    shutdown_pdf_pool()
+    shutdown_logging()
 
 # Create FastAPI app
 app = FastAPI(
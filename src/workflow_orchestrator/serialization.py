@@ -0,0 +1,16 @@
+from typing import Any
+import orjson
+
+# Indented, with non-string keys and unknown types (dates, ObjectIds)
+# stringified; used wherever structured data is rendered into a prompt
+_PROMPT_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Pretty-print a value as UTF-8 JSON for prompt context"""
+    return orjson.dumps(value, default=str, option=_PROMPT_OPTIONS)
+
+
+def to_json(value: Any) -> str:
+    """Pretty-print a value as JSON for prompt context"""
+    return to_json_bytes(value).decode()
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# Settings are read at import; keep tests off real credentials and data dirs
+os.environ.setdefault("OPENAI_API_KEY", "test")
+_data_dir = tempfile.mkdtemp(prefix="workflow-orchestrator-tests-")
+for _name in ("CHROMADB_PATH", "FAISS_PATH", "UPLOAD_DIR"):
+    os.environ.setdefault(_name, os.path.join(_data_dir, _name.lower()))
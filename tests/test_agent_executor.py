@@ -0,0 +1,65 @@
+from langchain_core.agents import AgentAction, AgentActionMessageLog
+from langchain_core.messages import AIMessage
+
+from workflow_orchestrator.infrastructure.agents.agent_executor import (
+    MAX_STEP_SUMMARY_CHARS,
+    MAX_VERBATIM_STEPS,
+    _trim_intermediate_steps,
+)
+
+
+def _step(i, message_log=None):
+    if message_log is None:
+        action = AgentAction(tool=f"tool_{i}", tool_input={"n": i}, log="")
+    else:
+        action = AgentActionMessageLog(
+            tool=f"tool_{i}", tool_input={"n": i}, log="", message_log=message_log
+        )
+    return action, f"result {i}"
+
+
+def test_short_histories_are_untouched():
+    steps = [_step(i) for i in range(MAX_VERBATIM_STEPS)]
+    assert _trim_intermediate_steps(steps) is steps
+
+
+def test_older_steps_are_summarized():
+    steps = [_step(i) for i in range(MAX_VERBATIM_STEPS + 4)]
+
+    trimmed = _trim_intermediate_steps(steps)
+
+    summary, observation = trimmed[0]
+    assert summary.tool == "history_summary"
+    assert observation == ""
+    assert "tool_0(" in summary.log and "result 3" in summary.log
+    assert "tool_4(" not in summary.log
+    assert len(summary.log) <= MAX_STEP_SUMMARY_CHARS
+    assert trimmed[1:] == steps[4:]
+
+
+def test_summary_is_capped():
+    steps = [(AgentAction(tool="t", tool_input="x" * 100, log=""), "y" * 100) for _ in range(50)]
+
+    trimmed = _trim_intermediate_steps(steps)
+
+    assert len(trimmed[0][0].log) == MAX_STEP_SUMMARY_CHARS
+    assert len(trimmed) == MAX_VERBATIM_STEPS + 1
+
+
+def test_parallel_tool_calls_are_not_split():
+    # Steps 3 and 4 are two tool calls from one LLM message; the cut would
+    # fall between them, so both must be kept
+    turn = [AIMessage(content="", id="turn-3")]
+    steps = [_step(i, turn if i in (3, 4) else None) for i in range(MAX_VERBATIM_STEPS + 4)]
+
+    trimmed = _trim_intermediate_steps(steps)
+
+    assert trimmed[1:] == steps[3:]
+    assert "tool_3(" not in trimmed[0][0].log
+
+
+def test_single_turn_history_is_untouched():
+    turn = [AIMessage(content="", id="turn")]
+    steps = [_step(i, turn) for i in range(MAX_VERBATIM_STEPS + 2)]
+
+    assert _trim_intermediate_steps(steps) is steps
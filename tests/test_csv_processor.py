@@ -0,0 +1,65 @@
+import asyncio
+from datetime import date, time
+
+import bson
+import pandas as pd
+
+from workflow_orchestrator.infrastructure.file_processors import CSVProcessor
+
+
+CSV_WITH_DATES = (
+    "day,at,stamp,amount,note\n"
+    "2024-01-05,10:30:00,2024-01-05 10:30:00,1,a\n"
+    "2024-02-01,11:00:00,2024-01-05T10:30,2,\n"
+)
+
+
+def _write_csv(tmp_path, content):
+    path = tmp_path / "dates.csv"
+    path.write_text(content)
+    return str(path)
+
+
+def test_date_columns_stay_text(tmp_path):
+    file_path = _write_csv(tmp_path, CSV_WITH_DATES)
+
+    result = asyncio.run(CSVProcessor().process(file_path))
+    data = result["data"]
+
+    assert data["rows"][0]["day"] == "2024-01-05"
+    assert data["rows"][0]["at"] == "10:30:00"
+    assert data["rows"][1]["stamp"] == "2024-01-05T10:30"
+    assert data["rows"][1]["note"] is None
+    assert data["summary"]["total_rows"] == 2
+
+    # Same column types as a plain pandas read
+    expected = {col: str(dtype) for col, dtype in pd.read_csv(file_path).dtypes.items()}
+    assert data["summary"]["column_types"] == expected
+
+
+def test_date_columns_are_storable(tmp_path):
+    file_path = _write_csv(tmp_path, CSV_WITH_DATES)
+
+    result = asyncio.run(CSVProcessor().process(file_path))
+
+    # FileService stores processed data in MongoDB
+    bson.encode({"processed_data": result})
+
+
+def test_convert_to_serializable_dates():
+    processor = CSVProcessor()
+
+    assert processor._convert_to_serializable(date(2024, 1, 5)) == "2024-01-05"
+    assert processor._convert_to_serializable(time(10, 30)) == "10:30:00"
+
+
+def test_duplicate_and_blank_headers_match_pandas(tmp_path):
+    file_path = _write_csv(tmp_path, ",a,a,b\n0,1,2,3\n1,4,5,6\n")
+
+    result = asyncio.run(CSVProcessor().process(file_path))
+    data = result["data"]
+
+    assert data["columns"] == pd.read_csv(file_path).columns.tolist()
+    assert data["columns"] == ["Unnamed: 0", "a", "a.1", "b"]
+    assert data["rows"][0] == {"Unnamed: 0": 0, "a": 1, "a.1": 2, "b": 3}
+    assert data["summary"]["total_columns"] == 4
@@ -0,0 +1,19 @@
+import asyncio
+
+import pandas as pd
+
+from workflow_orchestrator.infrastructure.file_processors import ExcelProcessor
+
+
+def test_column_types_cover_the_whole_sheet(tmp_path):
+    # Numeric for the preview rows, text further down
+    ids = list(range(10)) + ["pending"]
+    path = tmp_path / "mixed.xlsx"
+    pd.DataFrame({"id": ids, "value": range(11)}).to_excel(path, index=False)
+
+    result = asyncio.run(ExcelProcessor().process(str(path)))
+    sheet = result["sheets"]["Sheet1"]
+
+    assert sheet["summary"]["column_types"] == {"id": "object", "value": "int64"}
+    assert sheet["summary"]["total_rows"] == 11
+    assert len(sheet["rows"]) == 5
@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+import pytest
+
+from workflow_orchestrator.infrastructure.mcp.filesystem_mcp import FilesystemMCP
+
+
+@pytest.fixture
+def mcp(tmp_path, monkeypatch):
+    base = tmp_path / "uploads"
+    base.mkdir()
+    monkeypatch.setattr(
+        "workflow_orchestrator.infrastructure.mcp.filesystem_mcp.settings.UPLOAD_DIR", str(base)
+    )
+    return FilesystemMCP()
+
+
+def test_paths_inside_the_base_resolve(mcp):
+    base = mcp._base_path
+
+    assert mcp._resolve("report.csv") == base / "report.csv"
+    assert mcp._resolve("sub/../data.txt") == base / "data.txt"
+    assert mcp._resolve(".") == base
+
+
+@pytest.mark.parametrize("path", ["../secret.txt", "sub/../../secret.txt", "/etc/passwd"])
+def test_paths_outside_the_base_are_rejected(mcp, path):
+    with pytest.raises(ValueError):
+        mcp._resolve(path)
+
+
+def test_symlink_out_of_the_base_is_rejected(mcp, tmp_path):
+    outside = tmp_path / "outside.txt"
+    outside.write_text("secret")
+    os.symlink(outside, mcp._base_path / "link.txt")
+
+    with pytest.raises(ValueError):
+        mcp._resolve("link.txt")
+
+
+def test_operations_refuse_outside_paths(mcp, tmp_path):
+    outside = tmp_path / "outside.txt"
+    outside.write_text("secret")
+
+    async def run():
+        return (
+            await mcp.read_file("../outside.txt"),
+            await mcp.write_file("../written.txt", "x"),
+            await mcp.file_exists("../outside.txt"),
+        )
+
+    read, write, exists = asyncio.run(run())
+    assert read.startswith("Error reading file") and "secret" not in read
+    assert write.startswith("Error writing file")
+    assert not (tmp_path / "written.txt").exists()
+    assert exists is False
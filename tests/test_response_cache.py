@@ -0,0 +1,105 @@
+import asyncio
+
+import numpy as np
+
+from workflow_orchestrator.infrastructure.llm import response_cache
+from workflow_orchestrator.infrastructure.llm.response_cache import LLMResponseCache, SemanticResponseCache
+
+
+async def _embed(text):
+    return np.array([1.0, 0.0], dtype=np.float32)
+
+
+def _semantic_cache(**kwargs):
+    return SemanticResponseCache(_embed, threshold=0.9, **kwargs)
+
+
+def test_semantic_scopes_are_bounded():
+    cache = _semantic_cache(max_scopes=2)
+    vector = np.array([1.0, 0.0], dtype=np.float32)
+
+    async def run():
+        await cache.set("a", vector, "A")
+        await cache.set("b", vector, "B")
+        assert await cache.get("a", vector) == "A"  # "a" is now most recent
+        await cache.set("c", vector, "C")
+        return list(cache._scopes)
+
+    assert asyncio.run(run()) == ["a", "c"]
+
+
+def test_semantic_expired_scope_is_removed(monkeypatch):
+    cache = _semantic_cache(ttl=10)
+    vector = np.array([1.0, 0.0], dtype=np.float32)
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+
+    async def run():
+        await cache.set("a", vector, "A")
+        now[0] += 11
+        return await cache.get("a", vector)
+
+    assert asyncio.run(run()) is None
+    assert "a" not in cache._scopes
+
+
+def test_semantic_miss_does_not_create_scope():
+    cache = _semantic_cache()
+    vector = np.array([1.0, 0.0], dtype=np.float32)
+
+    assert asyncio.run(cache.get("unknown", vector)) is None
+    assert cache._scopes == {}
+
+
+def _clock(monkeypatch, start=1000.0):
+    now = [start]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_response_cache_expires_after_ttl(monkeypatch):
+    cache = LLMResponseCache(ttl=10)
+    now = _clock(monkeypatch)
+
+    async def run():
+        await cache.set("k", "value")
+        now[0] += 10
+        fresh = await cache.get("k")
+        now[0] += 1
+        return fresh, await cache.get("k")
+
+    assert asyncio.run(run()) == ("value", None)
+    assert "k" not in cache._entries
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_response_cache_per_entry_ttl(monkeypatch):
+    cache = LLMResponseCache(ttl=10)
+    now = _clock(monkeypatch)
+
+    async def run():
+        await cache.set("short", "a", ttl=1)
+        await cache.set("long", "b")
+        now[0] += 5
+        return await cache.get("short"), await cache.get("long")
+
+    assert asyncio.run(run()) == (None, "b")
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = LLMResponseCache(max_entries=2)
+
+    async def run():
+        await cache.set("a", "A")
+        await cache.set("b", "B")
+        await cache.get("a")  # "b" is now least recently used
+        await cache.set("c", "C")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(run()) == ["A", None, "C"]
+
+
+def test_response_cache_key_ignores_dict_order():
+    make_key = LLMResponseCache.make_key
+    assert make_key("m", {"a": 1, "b": 2}) == make_key("m", {"b": 2, "a": 1})
+    assert make_key("m", [("system", "x")]) != make_key("other", [("system", "x")])